@@ -0,0 +1,94 @@
+import numpy
+from Utils.CurveSet import CurveSet
+from Utils.WindowCache import WindowCache
+
+# The metrics of a backtest, every one of them is a (curves,folds) array
+METRICS = ["mse", "mae", "mape", "directionalAccuracy"]
+
+
+# Utility function to make the one-step-ahead prediction of a model for every value of every Curve of a CurveSet with a single batched forward pass
+#
+# Returns a (curves,width) matrix with the normalised predictions, where width is the length of the longest Curve
+# Each row is aligned to the right as in CurveSet.tail, hence the last column holds the prediction of the last value of every Curve
+# The first timesteps values of a Curve have no window and their predictions are NaN
+# In case cache is provided the windows are loaded from it instead of being sampled whenever possible (see WindowCache)
+def predictAligned(model, curves: CurveSet, timesteps: int, batchSize: int = 4096, cache: WindowCache = None):
+    width = curves.getValues().shape[1]
+
+    if cache is not None:
+        x, _, counts = cache.windows(curves, timesteps, 0, front=False, normalise=True)
+    else:
+        x = curves.sample(timesteps, 0, front=False, includeY=False, normalise=True, materialise=False)
+        counts = numpy.array([len(block) for block in x], dtype=int)
+        x = numpy.concatenate(x) if len(x) > 0 else numpy.empty((0, timesteps, 1), dtype="float32")
+
+    rows = numpy.repeat(numpy.arange(len(curves)), counts)
+    columns = width - numpy.repeat(counts, counts) + numpy.arange(numpy.sum(counts)) - numpy.repeat(numpy.cumsum(counts) - counts, counts)
+
+    predictions = numpy.full((len(curves), width), numpy.nan, dtype="float32")
+    if len(rows) > 0:
+        predictions[rows, columns] = numpy.asarray(model.predict(x, batch_size=batchSize, verbose=0))[:, 0]
+
+    return predictions
+
+
+# Utility function to average the valid values of every fold of every Curve, a fold without valid values is NaN
+def _foldMean(values: numpy.ndarray, valid: numpy.ndarray, shape: tuple):
+    sums = numpy.where(valid, values, 0.0).reshape(shape).sum(axis=2)
+    counts = valid.reshape(shape).sum(axis=2)
+    return numpy.divide(sums, counts, out=numpy.full(shape[:2], numpy.nan), where=counts > 0)
+
+
+# Utility function to backtest a model on every Curve of a CurveSet over folds consecutive walk-forward folds
+#
+# Given :
+# - A Curve C of length 100
+# - The function call backtest(model,curves,timesteps,folds=4,foldLength=5)
+#
+# The origins of the folds will be 80, 85, 90 and 95 and the k-th fold will test the predictions of the values [origin_k,origin_k+5) of C
+# Every Curve of the set is cut at the same distance from its last value, hence folds * foldLength should be less than the length of the Curves
+#
+# Every value of every Curve is predicted once (see predictAligned) and each fold is a slice of those predictions,
+# hence a backtest over many folds costs about as much as a single pass over the Curves
+# The MSE and the MAE are computed on the normalised values as model.evaluate() does, the MAPE and the directional accuracy on the actual values,
+# where the direction of a prediction is its sign relative to the previous actual value
+#
+# Returns a dictionary with the origin of every fold, the number of predicted values of every fold and every one of METRICS as (curves,folds) arrays
+def backtest(model, curves: CurveSet, timesteps: int, folds: int, foldLength: int, batchSize: int = 4096, cache: WindowCache = None):
+    width = curves.getValues().shape[1]
+    start = width - folds * foldLength
+    shape = (len(curves), folds, foldLength)
+
+    predictions = predictAligned(model, curves, timesteps, batchSize, cache)[:, start:]
+    actual = curves.tail(width, normalise=True)[:, start:]
+    values = curves.tail(width, normalise=False)
+    previous = values[:, start - 1:-1]
+    values = values[:, start:]
+    denormalised = curves.denormalise(predictions)
+
+    errors = predictions - actual
+    valid = ~numpy.isnan(errors)
+
+    with numpy.errstate(divide="ignore", invalid="ignore"):
+        metrics = {
+            "origin": curves.getLengths()[:, numpy.newaxis] - (folds - numpy.arange(folds)) * foldLength,
+            "windows": valid.reshape(shape).sum(axis=2),
+            "mse": _foldMean(errors ** 2, valid, shape),
+            "mae": _foldMean(numpy.abs(errors), valid, shape),
+            "mape": _foldMean(numpy.abs(denormalised - values) / numpy.abs(values), valid & (values != 0), shape),
+            "directionalAccuracy": _foldMean(numpy.sign(denormalised - previous) == numpy.sign(values - previous), valid & ~numpy.isnan(previous), shape)
+        }
+
+    return metrics
+
+
+# Utility function to flatten the (curves,folds) arrays of a backtest into columns, with one row per Curve and fold
+def columns(curves: CurveSet, label: str, metrics: dict):
+    folds = metrics["origin"].shape[1]
+    flattened = {
+        "id": numpy.repeat(numpy.array(curves.getIDs(), dtype=object), folds),
+        "model": numpy.full(len(curves) * folds, label, dtype=object),
+        "fold": numpy.tile(numpy.arange(folds), len(curves))
+    }
+    flattened.update({column: values.reshape(-1) for column, values in metrics.items()})
+    return flattened
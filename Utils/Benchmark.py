@@ -0,0 +1,41 @@
+import gc
+import time
+import tracemalloc
+
+
+# Utility function to measure a stage of the benchmark suite
+#
+# The stage is timed repeats times and the fastest run is kept, as it is the one least disturbed by the rest of the system
+# The peak memory that the stage allocates is measured on a separate run with tracemalloc, so that tracing does not slow down the timed runs
+# NumPy reports its allocations to tracemalloc, while the allocations of TensorFlow are only visible in the peak RSS of the process
+#
+# Returns a dictionary with the fastest and the mean time (in seconds) and the peak memory (in bytes) of the stage
+def measure(stage, repeats: int = 3):
+    timings = []
+    for _ in range(max(1, repeats)):
+        gc.collect()
+        start = time.perf_counter()
+        stage()
+        timings.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    stage()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {"seconds": min(timings), "meanSeconds": sum(timings) / len(timings), "peakMemory": peak}
+
+
+# Utility function to compare the stages of a benchmark against the ones of a baseline benchmark
+# A stage regresses in case it is slower than (1 + threshold) times its baseline time, the stages that are missing from either benchmark are ignored
+#
+# Returns a list of (stage, seconds, baseline seconds) tuples, one per regressed stage
+def compare(stages: dict, baseline: dict, threshold: float = 0.2):
+    regressions = []
+
+    for stage, result in stages.items():
+        if stage in baseline and result["seconds"] > (1.0 + threshold) * baseline[stage]["seconds"]:
+            regressions.append((stage, result["seconds"], baseline[stage]["seconds"]))
+
+    return regressions
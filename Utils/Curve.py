@@ -1,32 +1,113 @@
 import random
 from typing import Union
 import numpy
+from numpy.lib.stride_tricks import sliding_window_view
 
 
 class Curve:
     # Static variable of the Curve class that is used in Curve.normalise/denormalise
     __divisor = 10.0
 
-    def __init__(self, id: Union[int, str, float], values: numpy.ndarray):
+    # In case copy is False the Curve is a view of the provided values (e.g. a row of a CurveSet)
+    # In case minimum and maximum are provided they are not recomputed
+    def __init__(self, id: Union[int, str, float], values: numpy.ndarray, minimum: float = None, maximum: float = None, copy: bool = True):
         self.__id = str(id)
-        self.__values = numpy.array(values)
-        self.__min = numpy.min(self.__values)
-        self.__max = numpy.max(self.__values)
+        self.__values = numpy.array(values) if copy else numpy.asarray(values)
+        self.__min = numpy.min(self.__values) if minimum is None else minimum
+        self.__max = numpy.max(self.__values) if maximum is None else maximum
+        self.__buffer = self.__values
+        self.__pending = 0
 
     # Implementation of the __len__() function in the context of the Curve class
     def __len__(self):
         return len(self.__values)
 
+    # Utility function to append new values (e.g. the latest prices) to a Curve in amortised O(1) time per value
+    #
+    # The values are kept in a buffer that doubles in size whenever it runs out of room, hence a Curve that was
+    # a view of another array (e.g. a row of a CurveSet) gets its own buffer on its first append
+    # The min/max of the Curve are updated incrementally and True is returned in case they changed,
+    # since the previously normalised sequences of the Curve no longer match the ones that Curve.normalise would produce
+    def append(self, values: Union[float, numpy.ndarray]):
+        values = numpy.atleast_1d(numpy.asarray(values, dtype=self.__buffer.dtype))
+        length = len(self.__values)
+
+        if length + len(values) > len(self.__buffer):
+            buffer = numpy.empty(max(2 * len(self.__buffer), length + len(values)), dtype=self.__buffer.dtype)
+            buffer[:length] = self.__values
+            self.__buffer = buffer
+
+        self.__buffer[length:length + len(values)] = values
+        self.__values = self.__buffer[:length + len(values)]
+        self.__pending += len(values)
+
+        if len(values) == 0:
+            return False
+
+        minimum = min(self.__min, numpy.min(values))
+        maximum = max(self.__max, numpy.max(values))
+        changed = minimum != self.__min or maximum != self.__max
+        self.__min = minimum
+        self.__max = maximum
+        return changed
+
+    # Utility function to get only the windows that end at the values appended since the last call, as in the following example
+    #
+    # Given :
+    # - A Curve C with the following values V = [1,2,3,4,5]
+    # - The function calls C.append([6,7]) and X = C.pending(timesteps=3,normalise=False)
+    #
+    # X will be [[[4],[5],[6]],[[5],[6],[7]]], that is the inputs that predict the value after 6 and the value after 7
+    def pending(self, timesteps: int, normalise: bool, a: float = 0.0, b: float = 1.0):
+        count = min(self.__pending, max(0, len(self) - timesteps + 1))
+        values = self.__values[len(self) - (timesteps + count - 1):] if count > 0 else self.__values[:0]
+        self.__pending = 0
+
+        if normalise and a < b:
+            values = self.normalise(values, a, b)
+
+        if count == 0:
+            return numpy.empty((0, timesteps, 1), dtype=values.dtype)
+
+        return numpy.array(sliding_window_view(values, timesteps)[:, :, numpy.newaxis])
+
+    # Utility static function to window a sequence through strided views, as in the following example
+    #
+    # Given :
+    # - A sequence V = [1,2,3,4,5,6]
+    # - The function call X,Y = Curve.window(V,timesteps=4,includeY=True,materialise=False)
+    #
+    # X will be a read-only (2,4,1) view of V over [[1,2,3,4],[2,3,4,5]] and Y a read-only (2,1) view of V over [[5],[6]]
+    # In case materialise is True X and Y are copied into contiguous arrays that own their data
+    @staticmethod
+    def window(values: numpy.ndarray, timesteps: int, includeY: bool, materialise: bool = True):
+        values = numpy.asarray(values)
+
+        if len(values) > timesteps:
+            xSample = sliding_window_view(values[:-1], timesteps)[:, :, numpy.newaxis]
+            ySample = values[timesteps:, numpy.newaxis]
+        else:
+            xSample = numpy.empty((0, timesteps, 1), dtype=values.dtype)
+            ySample = numpy.empty((0, 1), dtype=values.dtype)
+
+        if materialise:
+            xSample = numpy.array(xSample)
+            ySample = numpy.array(ySample)
+
+        if includeY:
+            return xSample, ySample
+        else:
+            return xSample
+
     # Utility function to sample a Curve as in the following example
     #
     # Given :
     # - A Curve C with the following values V = [1,2,3,4,5,6,7,8,9,10]
     # - The function call X,Y = C.sample(timesteps=4,length=8,front=True,includeY=True,normalise=False)
     #
-    # X will be [[1,2,3,4],[2,3,4,5],[3,4,5,6],[4,5,6,7]] and Y will be [[5],[6],[7],[8]]
-    def sample(self, timesteps: int, length: int, front: bool, includeY: bool, normalise: bool, a: float = 0.0, b: float = 1.0):
-        xSample = []
-        ySample = []
+    # X will be [[[1],[2],[3],[4]],[[2],[3],[4],[5]],[[3],[4],[5],[6]],[[4],[5],[6],[7]]] and Y will be [[5],[6],[7],[8]]
+    # In case materialise is False X and Y are read-only views (see Curve.window)
+    def sample(self, timesteps: int, length: int, front: bool, includeY: bool, normalise: bool, a: float = 0.0, b: float = 1.0, materialise: bool = True):
         values = None
 
         if length <= 0 or length > len(self):
@@ -40,15 +121,7 @@ class Curve:
         if normalise and a < b:
             values = self.normalise(values, a, b)
 
-        for i in range(timesteps, len(values)):
-            xSample.append(values[(i - timesteps):i])
-            if includeY:
-                ySample.append([values[i]])
-
-        if includeY:
-            return numpy.array(xSample), numpy.array(ySample)
-        else:
-            return numpy.array(xSample)
+        return Curve.window(values, timesteps, includeY, materialise)
 
     # Utility static function to sample a set of Curves as in the following example
     #
@@ -57,9 +130,10 @@ class Curve:
     # - Curve C2 with the following values V2 = [10,20,30,40,50]
     # - The function call Curve.sampleSet([C1,C2],timesteps=3,length=4,front=True,includeY=True,normalise=False)
     #
-    # X will be [[1,2,3],[2,3,4],[10,20,30],[20,30,40]] and Y will be [[4],[5],[40],[50]]
+    # X will be [[[1],[2],[3]],[[2],[3],[4]],[[10],[20],[30]],[[20],[30],[40]]] and Y will be [[4],[5],[40],[50]]
+    # In case materialise is False X and Y will be lists holding the read-only views of each Curve (see Curve.window)
     @staticmethod
-    def sampleSet(dataset: list, timesteps: int, length: int, front: bool, includeY: bool, normalise: bool, a: float = 0.0, b: float = 1.0):
+    def sampleSet(dataset: list, timesteps: int, length: int, front: bool, includeY: bool, normalise: bool, a: float = 0.0, b: float = 1.0, materialise: bool = True):
 
         xSample = []
         ySample = []
@@ -71,24 +145,27 @@ class Curve:
 
             values = curve.getValues()
 
-            if normalise and a < b:
-                values = curve.normalise(values, a, b)
-
             if front:
                 values = values[:length]
 
             else:
                 values = values[len(curve) - length:]
 
-            for i in range(timesteps, len(values)):
-                xSample.append(values[(i - timesteps):i])
-                if includeY:
-                    ySample.append([values[i]])
+            if normalise and a < b:
+                values = curve.normalise(values, a, b)
+
+            x, y = Curve.window(values, timesteps, includeY=True, materialise=False)
+            xSample.append(x)
+            ySample.append(y)
+
+        if materialise:
+            xSample = numpy.concatenate(xSample)
+            ySample = numpy.concatenate(ySample)
 
         if includeY:
-            return numpy.array(xSample), numpy.array(ySample)
+            return xSample, ySample
 
-        return numpy.array(xSample)
+        return xSample
 
     # Utility function to normalise a sequence in the [a,b] range using the following linear transformation :
     # Normalised-Sequence = < (b-a) * [{Sequence - CurveObject.min}/{CurveObject.max - CurveObject.min}] > + a
@@ -134,14 +211,19 @@ class Curve:
     def getValues(self):
         return self.__values
 
+    def getMin(self):
+        return self.__min
+
+    def getMax(self):
+        return self.__max
+
+    @staticmethod
+    def getDivisor():
+        return Curve.__divisor
+
     def getID(self):
         return self.__id
 
     # Utility function to create the CSV representation of a Curve object
     def toCSV(self, delimiter: str = "\t"):
-        csvRepresenation = self.__id + delimiter
-        for i in range(len(self.__values)):
-            csvRepresenation += str(self.__values[i])
-            if i != (len(self.__values) - 1):
-                csvRepresenation += delimiter
-        return csvRepresenation
+        return self.__id + delimiter + delimiter.join(self.__values.astype(str).tolist())
@@ -0,0 +1,256 @@
+from typing import Union
+import numpy
+from numpy.lib.stride_tricks import sliding_window_view
+from Utils import Metrics
+from Utils.Curve import Curve
+
+
+class CurveSet:
+
+    # The values of every Curve are kept as the rows of a single contiguous float32 matrix
+    # The Curve objects handed out by a CurveSet are views of the rows of that matrix
+    #
+    # In case the Curves have different lengths (i.e. lengths is provided) each row holds the values
+    # of its Curve from the left and is padded with NaN up to the length of the longest Curve
+    def __init__(self, ids: list, values: numpy.ndarray, mins: numpy.ndarray = None, maxs: numpy.ndarray = None, lengths: numpy.ndarray = None):
+        self.__ids = [str(id) for id in ids]
+        self.__values = numpy.asarray(values, dtype="float32")
+        self.__index = {id: row for row, id in enumerate(self.__ids)}
+        self.__lengths = numpy.full(len(self.__ids), self.__values.shape[1], dtype=int) if lengths is None else numpy.array(lengths, dtype=int)
+        self.__ragged = bool(numpy.any(self.__lengths != self.__values.shape[1]))
+        self.__mins = numpy.nanmin(self.__values, axis=1, keepdims=True) if mins is None else numpy.array(mins, dtype="float32").reshape((-1, 1))
+        self.__maxs = numpy.nanmax(self.__values, axis=1, keepdims=True) if maxs is None else numpy.array(maxs, dtype="float32").reshape((-1, 1))
+        self.__curves = [None] * len(self.__ids)
+        self.__buffer = None
+        self.__pending = numpy.zeros(len(self.__ids), dtype=int)
+
+    # Implementation of the __len__() function in the context of the CurveSet class
+    # As with a list of Curves it is the number of Curves in the set
+    def __len__(self):
+        return len(self.__ids)
+
+    # Implementation of the __getitem__() function in the context of the CurveSet class
+    # An integer index or a Curve ID returns a Curve, a slice or a list of indices/IDs returns a CurveSet (see CurveSet.select)
+    def __getitem__(self, key: Union[int, str, slice, list]):
+        if isinstance(key, (slice, list, numpy.ndarray)):
+            return self.select(key)
+
+        row = self.indexOf(key) if isinstance(key, str) else int(key)
+
+        if row < 0:
+            row += len(self)
+
+        if self.__curves[row] is None:
+            self.__curves[row] = Curve(self.__ids[row], self.__values[row, :self.__lengths[row]], minimum=self.__mins[row, 0], maximum=self.__maxs[row, 0], copy=False)
+
+        return self.__curves[row]
+
+    # Implementation of the __iter__() function in the context of the CurveSet class
+    def __iter__(self):
+        for row in range(len(self)):
+            yield self[row]
+
+    # Implementation of the __contains__() function in the context of the CurveSet class
+    def __contains__(self, id: str):
+        return str(id) in self.__index
+
+    # Utility function to get the row of a Curve given its ID
+    def indexOf(self, id: Union[int, str, float]):
+        return self.__index[str(id)]
+
+    # Utility function to create a CurveSet of the selected Curves, given either their indices or their IDs
+    def select(self, keys: Union[slice, list, numpy.ndarray]):
+        if isinstance(keys, slice):
+            rows = numpy.arange(len(self))[keys]
+        else:
+            rows = numpy.array([self.indexOf(key) if isinstance(key, str) else int(key) for key in keys], dtype=int)
+
+        return CurveSet([self.__ids[row] for row in rows], self.__values[rows], self.__mins[rows], self.__maxs[rows], self.__lengths[rows])
+
+    # Utility function to append new values (e.g. the latest prices) to the Curves of the set in amortised O(1) time per value
+    #
+    # The i-th row of values is appended to the Curve of the i-th row in rows (every Curve of the set by default)
+    # The values are kept in a buffer that doubles in size whenever it runs out of room, the first append always copies
+    # the values of the set into such a buffer since they may be shared with another array (e.g. a memory-mapped cache)
+    # The Curve objects that were handed out before an append are not updated, hence they should be requested again
+    #
+    # The min/max of the Curves are updated incrementally and a boolean array is returned that marks the Curves whose min/max changed,
+    # since the previously normalised sequences of those Curves no longer match the ones that CurveSet.normalise would produce
+    def append(self, values: numpy.ndarray, rows: Union[list, numpy.ndarray] = None):
+        rows = numpy.arange(len(self)) if rows is None else numpy.array([self.indexOf(row) if isinstance(row, str) else int(row) for row in rows], dtype=int)
+        values = numpy.asarray(values, dtype="float32").reshape((len(rows), -1))
+        count = values.shape[1]
+        width = max(self.__values.shape[1], int(numpy.max(self.__lengths[rows], initial=0)) + count)
+
+        if self.__buffer is None or width > self.__buffer.shape[1]:
+            capacity = width if self.__buffer is None else max(2 * self.__buffer.shape[1], width)
+            buffer = numpy.full((len(self), capacity), numpy.nan, dtype="float32")
+            buffer[:, :self.__values.shape[1]] = self.__values
+            self.__buffer = buffer
+
+        self.__buffer[rows[:, numpy.newaxis], self.__lengths[rows, numpy.newaxis] + numpy.arange(count)] = values
+        self.__values = self.__buffer[:, :width]
+        self.__lengths[rows] += count
+        self.__ragged = bool(numpy.any(self.__lengths != width))
+        self.__pending[rows] += count
+
+        for row in rows:
+            self.__curves[row] = None
+
+        if count == 0:
+            return numpy.zeros(len(rows), dtype=bool)
+
+        mins = numpy.minimum(self.__mins[rows], numpy.min(values, axis=1, keepdims=True))
+        maxs = numpy.maximum(self.__maxs[rows], numpy.max(values, axis=1, keepdims=True))
+        changed = (mins != self.__mins[rows]) | (maxs != self.__maxs[rows])
+        self.__mins[rows] = mins
+        self.__maxs[rows] = maxs
+        return changed[:, 0]
+
+    # Utility function to get only the windows that end at the values appended since the last call (see Curve.pending)
+    # Returns the windows as a (windows,timesteps,1) array and the row of the Curve each window belongs to
+    def pending(self, timesteps: int, normalise: bool, a: float = 0.0, b: float = 1.0):
+        counts = numpy.minimum(self.__pending, numpy.maximum(0, self.__lengths - timesteps + 1))
+        count = int(numpy.max(counts, initial=0))
+        self.__pending[:] = 0
+
+        if count == 0:
+            return numpy.empty((0, timesteps, 1), dtype="float32"), numpy.empty(0, dtype=int)
+
+        windows = sliding_window_view(self.tail(timesteps + count - 1, normalise, a, b), timesteps, axis=1)
+        mask = numpy.arange(count) >= count - counts[:, numpy.newaxis]
+
+        return windows[mask][:, :, numpy.newaxis], numpy.nonzero(mask)[0]
+
+    # Utility function to broadcast a per-Curve column (i.e. mins, maxs) against a batch of sequences
+    @staticmethod
+    def __broadcast(column: numpy.ndarray, sequences: numpy.ndarray):
+        return numpy.reshape(column, (column.shape[0],) + (1,) * (numpy.ndim(sequences) - 1))
+
+    # Utility function to normalise a batch of sequences in the [a,b] range, as Curve.normalise does for a single sequence
+    # The i-th sequence is normalised with the statistics of the i-th row in rows (every Curve of the set by default)
+    # In case sequences is None the values of the corresponding Curves are normalised
+    def normalise(self, sequences: numpy.ndarray = None, a: float = 0.0, b: float = 1.0, rows: Union[list, numpy.ndarray] = None):
+        rows = numpy.arange(len(self)) if rows is None else numpy.asarray(rows)
+
+        if sequences is None:
+            sequences = self.__values[rows]
+
+        if a < b:
+            mins = CurveSet.__broadcast(self.__mins[rows], sequences)
+            maxs = CurveSet.__broadcast(self.__maxs[rows], sequences)
+            flat = maxs <= mins
+            with numpy.errstate(divide="ignore", invalid="ignore"):
+                ranged = ((b - a) * ((sequences - mins) / numpy.where(flat, maxs, maxs - mins))) + a
+                scaled = (sequences / maxs) / Curve.getDivisor()
+            sequences = numpy.where(flat, scaled, ranged)
+
+        return sequences
+
+    # Utility function to denormalise a batch of sequences that were normalised in the [a,b] range, as Curve.denormalise does for a single sequence
+    # The i-th sequence is denormalised with the statistics of the i-th row in rows (every Curve of the set by default)
+    def denormalise(self, sequences: numpy.ndarray, a: float = 0.0, b: float = 1.0, rows: Union[list, numpy.ndarray] = None):
+        rows = numpy.arange(len(self)) if rows is None else numpy.asarray(rows)
+
+        if a < b:
+            mins = CurveSet.__broadcast(self.__mins[rows], sequences)
+            maxs = CurveSet.__broadcast(self.__maxs[rows], sequences)
+            flat = maxs <= mins
+            ranged = (((sequences - a) * (maxs - mins)) / (b - a)) + mins
+            scaled = (sequences * Curve.getDivisor()) * maxs
+            sequences = numpy.where(flat, scaled, ranged)
+
+        return sequences
+
+    # Utility function to get the last count values of every Curve of the set as a (curves,count) matrix
+    # In case count is greater than the length of a Curve its row is padded with NaN from the left
+    def tail(self, count: int, normalise: bool, a: float = 0.0, b: float = 1.0):
+        columns = self.__lengths[:, numpy.newaxis] - count + numpy.arange(count)
+        values = numpy.take_along_axis(self.__values, numpy.clip(columns, 0, None), axis=1)
+        values = numpy.where(columns >= 0, values, numpy.float32(numpy.nan))
+
+        if normalise and a < b:
+            values = self.normalise(values, a, b)
+
+        return values
+
+    # Utility function to sample every Curve of the set at once
+    # The result is the same as the one of Curve.sampleSet(list(curveSet),...) but it is produced by a handful of array operations
+    # In case materialise is False X and Y will be lists holding the read-only views of each Curve (see Curve.window)
+    #
+    # In case the Curves have different lengths each Curve is sampled on its own (see Curve.sample)
+    def sample(self, timesteps: int, length: int, front: bool, includeY: bool, normalise: bool, a: float = 0.0, b: float = 1.0, materialise: bool = True):
+        if self.__ragged:
+            return self.__sampleRagged(timesteps, length, front, includeY, normalise, a, b, materialise)
+
+        width = self.__values.shape[1]
+
+        if length <= 0 or length > width:
+            length = width
+
+        if front:
+            values = self.__values[:, :length]
+        else:
+            values = self.__values[:, width - length:]
+
+        if normalise and a < b:
+            values = self.normalise(values, a, b)
+
+        if length > timesteps:
+            xSample = sliding_window_view(values[:, :-1], timesteps, axis=1)[:, :, :, numpy.newaxis]
+            ySample = values[:, timesteps:, numpy.newaxis]
+        else:
+            xSample = numpy.empty((len(self), 0, timesteps, 1), dtype=values.dtype)
+            ySample = numpy.empty((len(self), 0, 1), dtype=values.dtype)
+
+        Metrics.count("windows", xSample.shape[0] * xSample.shape[1])
+
+        if materialise:
+            xSample = numpy.array(xSample).reshape((-1, timesteps, 1))
+            ySample = numpy.array(ySample).reshape((-1, 1))
+        else:
+            xSample = list(xSample)
+            ySample = list(ySample)
+
+        if includeY:
+            return xSample, ySample
+
+        return xSample
+
+    # Utility function to sample every Curve of a CurveSet whose Curves have different lengths
+    def __sampleRagged(self, timesteps: int, length: int, front: bool, includeY: bool, normalise: bool, a: float, b: float, materialise: bool):
+        xSample = []
+        ySample = []
+
+        for curve in self:
+            x, y = curve.sample(timesteps, length, front, includeY=True, normalise=normalise, a=a, b=b, materialise=False)
+            xSample.append(x)
+            ySample.append(y)
+            Metrics.count("windows", len(x))
+
+        if materialise:
+            xSample = numpy.concatenate(xSample)
+            ySample = numpy.concatenate(ySample)
+
+        if includeY:
+            return xSample, ySample
+
+        return xSample
+
+    def getIDs(self):
+        return self.__ids
+
+    def getValues(self):
+        return self.__values
+
+    def getLengths(self):
+        return self.__lengths
+
+    def isRagged(self):
+        return self.__ragged
+
+    def getMins(self):
+        return self.__mins
+
+    def getMaxs(self):
+        return self.__maxs
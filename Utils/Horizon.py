@@ -0,0 +1,20 @@
+import numpy
+from Utils.CurveSet import CurveSet
+
+
+# Utility function to forecast the next horizon values of every Curve of a CurveSet by rolling a one-step-ahead model forward
+#
+# The model predicts the value that follows the last timesteps values of every Curve, that prediction is appended
+# to the window of its Curve and the process is repeated horizon times, hence every step is a single batched prediction
+# for the whole set and every Curve is forecast by predicting on its own previous predictions
+#
+# Returns a (curves,horizon) array with the denormalised forecasts
+def forecastRecursive(model, curves: CurveSet, timesteps: int, horizon: int, batchSize: int = 4096):
+    buffer = numpy.empty((len(curves), timesteps + horizon), dtype="float32")
+    buffer[:, :timesteps] = curves.tail(timesteps, normalise=True)
+
+    for h in range(horizon):
+        x = buffer[:, h:h + timesteps, numpy.newaxis]
+        buffer[:, timesteps + h] = numpy.asarray(model.predict(x, batch_size=batchSize, verbose=0))[:, 0]
+
+    return curves.denormalise(buffer[:, timesteps:])
@@ -0,0 +1,35 @@
+import numpy
+from Utils.CurveSet import CurveSet
+from Utils.WindowCache import WindowCache
+
+
+# Utility function to make the predictions of a model for every Curve of a CurveSet with a single batched forward pass
+#
+# The windows of the last length values of every Curve (i.e. as in Curve.sample(...,front=False,...)) are stacked into one batch
+# Returns a list with the denormalised predictions of each Curve as a 1D array and an array with the MSE of each Curve,
+# where the MSE is computed on the normalised values in the same way as model.evaluate() does
+#
+# In case cache is provided the windows are loaded from it instead of being sampled whenever possible (see WindowCache)
+def predictSet(model, curves: CurveSet, timesteps: int, length: int, batchSize: int = 4096, cache: WindowCache = None):
+    if cache is not None:
+        x, y, counts = cache.windows(curves, timesteps, length, front=False, normalise=True)
+    else:
+        x, y = curves.sample(timesteps, length, front=False, includeY=True, normalise=True, materialise=False)
+        counts = numpy.array([len(block) for block in x])
+        x = numpy.concatenate(x)
+        y = numpy.concatenate(y)
+
+    rows = numpy.repeat(numpy.arange(len(curves)), counts)
+
+    if len(x) > 0:
+        predictions = numpy.asarray(model.predict(x, batch_size=batchSize, verbose=0), dtype="float32")
+    else:
+        predictions = numpy.empty((0, 1), dtype="float32")
+
+    squaredErrors = numpy.bincount(rows, weights=((predictions - y) ** 2)[:, 0], minlength=len(curves))
+    mses = numpy.divide(squaredErrors, counts, out=numpy.full(len(curves), numpy.nan), where=counts > 0)
+
+    predictions = curves.denormalise(predictions, rows=rows)[:, 0]
+    predictions = numpy.split(predictions, numpy.cumsum(counts)[:-1])
+
+    return predictions, mses
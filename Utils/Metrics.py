@@ -0,0 +1,103 @@
+import atexit
+import contextlib
+import cProfile
+import json
+import sys
+import time
+
+# The resource module only exists on POSIX systems, elsewhere the peak resident set size is not reported
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# The instrumentation of a run is off unless enable() is called, in which case stage() and count() only cost a function call and a check
+_enabled = False
+_start = None
+_stages = {}
+_counters = {}
+_profiler = None
+_disabled = contextlib.nullcontext()
+
+
+# Utility function to get the peak resident set size of the process in bytes, or None in case the system does not report it
+def peakRSS():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class _Stage:
+
+    def __init__(self, name: str):
+        self.__name = name
+        self.__start = None
+
+    def __enter__(self):
+        self.__start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exception):
+        timing = _stages.setdefault(self.__name, [0.0, 0])
+        timing[0] += time.perf_counter() - self.__start
+        timing[1] += 1
+        return False
+
+
+# Utility function to turn the instrumentation of the run on
+# At exit the summary of the run (see summary) is written as JSON to summaryPath, or to the standard output in case summaryPath is "-"
+# In case profilePath is provided the whole run is also profiled with cProfile and the statistics are dumped to profilePath (see pstats)
+def enable(summaryPath: str = "-", profilePath: str = None):
+    global _enabled, _start, _profiler
+
+    _enabled = True
+    _start = time.perf_counter()
+
+    if profilePath is not None:
+        _profiler = cProfile.Profile()
+        _profiler.enable()
+
+    atexit.register(_dump, summaryPath, profilePath)
+
+
+def isEnabled():
+    return _enabled
+
+
+# Utility function to time a stage of the run as a context manager, e.g. with stage("parse"): ...
+# The time of every stage accumulates over its calls, a stage that is nested in another one is also included in the time of the latter
+def stage(name: str):
+    if not _enabled:
+        return _disabled
+    return _Stage(name)
+
+
+# Utility function to increase a counter of the run (e.g. windows, curves, modelsLoaded, cacheHits) by amount
+def count(name: str, amount: int = 1):
+    if _enabled:
+        _counters[name] = _counters.get(name, 0) + amount
+
+
+# Utility function to get the summary of the run, that is the time and the number of calls of every stage, every counter,
+# the wall time since enable() was called and the peak resident set size of the process in bytes
+def summary():
+    return {
+        "wallSeconds": time.perf_counter() - _start if _start is not None else 0.0,
+        "stages": {name: {"seconds": seconds, "calls": calls} for name, (seconds, calls) in _stages.items()},
+        "counters": dict(_counters),
+        "peakRSS": peakRSS()
+    }
+
+
+def _dump(summaryPath: str, profilePath: str):
+    if _profiler is not None:
+        _profiler.disable()
+        _profiler.dump_stats(profilePath)
+
+    if summaryPath == "-":
+        json.dump(summary(), sys.stdout, indent=4)
+        sys.stdout.write("\n")
+    else:
+        with open(summaryPath, "w") as summaryFile:
+            json.dump(summary(), summaryFile, indent=4)
@@ -0,0 +1,124 @@
+import json
+import os
+from collections import OrderedDict
+import numpy
+from Utils import Metrics
+from Utils.NumpyLSTM import NumpyLSTM
+
+
+class ModelRegistry:
+
+    # Static variable of the ModelRegistry class that names the directory of a SavedModel
+    __modelDirectory = "Model"
+
+    # Static variable of the ModelRegistry class that lists the supported engines
+    __engines = ["keras", "numpy", "float16", "int8"]
+
+    @staticmethod
+    def getEngines():
+        return list(ModelRegistry.__engines)
+
+    # Utility function to read the input window length (i.e. timesteps) of a SavedModel without loading it
+    # The Keras metadata of a SavedModel starts with the JSON configuration of the model, which includes its input shape
+    @staticmethod
+    def readTimesteps(modelPath: str):
+        with open(os.path.join(modelPath, "keras_metadata.pb"), "rb") as metadataFile:
+            metadata = metadataFile.read()
+
+        start = metadata.find(b"{")
+        configuration, _ = json.JSONDecoder().raw_decode(metadata[start:].decode("utf-8", errors="ignore"))
+        inputShape = configuration["config"]["layers"][0]["config"]["batch_input_shape"]
+
+        if isinstance(inputShape, dict):
+            inputShape = inputShape["items"]
+
+        return int(inputShape[1])
+
+    # The generic model is expected in the genericPath directory and each dedicated model in the dedicatedPath/<ID>/Model directory
+    # Both are discovered once, although no model is loaded until it is requested
+    # At most capacity models are kept loaded at any given moment, the least recently used one is evicted first
+    #
+    # In case engine is "numpy" the weights that were exported next to each SavedModel (i.e. Model.npz, see forecastExport.py)
+    # are loaded as NumpyLSTM models instead, hence TensorFlow is never imported
+    # In case engine is "float16" or "int8" the quantized weights that were exported in the same way (i.e. Model.int8.npz) are loaded
+    def __init__(self, genericPath: str = "Model", dedicatedPath: str = "Dedicated-Models", capacity: int = 8, loader=None, engine: str = "keras"):
+        self.__paths = {}
+        self.__timesteps = {}
+        self.__models = OrderedDict()
+        self.__capacity = max(1, capacity)
+        self.__loader = loader
+        self.__engine = engine
+        self.__precision = "float32" if engine == "numpy" else engine
+        self.__loads = 0
+        self.__hits = 0
+
+        if self.__exists(genericPath):
+            self.__paths[None] = genericPath
+
+        if os.path.isdir(dedicatedPath):
+            for id in sorted(os.listdir(dedicatedPath)):
+                modelPath = os.path.join(dedicatedPath, id, ModelRegistry.__modelDirectory)
+                if self.__exists(modelPath):
+                    self.__paths[id] = modelPath
+
+        for id, modelPath in self.__paths.items():
+            if self.__engine != "keras":
+                with numpy.load(NumpyLSTM.exportPath(modelPath, self.__precision)) as weights:
+                    self.__timesteps[id] = int(weights["timesteps"])
+            else:
+                self.__timesteps[id] = ModelRegistry.readTimesteps(modelPath)
+
+    # Utility function to determine whether the model of a path exists for the engine of the registry
+    def __exists(self, modelPath: str):
+        if self.__engine != "keras":
+            return os.path.isfile(NumpyLSTM.exportPath(modelPath, self.__precision))
+        return os.path.isdir(modelPath)
+
+    # Utility function to load a model with the provided loader, NumpyLSTM.load() or the Keras load_model() function
+    def __load(self, modelPath: str):
+        if self.__loader is None and self.__engine != "keras":
+            self.__loader = lambda path: NumpyLSTM.load(NumpyLSTM.exportPath(path, self.__precision))
+        elif self.__loader is None:
+            from tensorflow.python.keras.models import load_model
+            self.__loader = load_model
+        return self.__loader(modelPath)
+
+    # Utility function to determine whether a Curve has a dedicated model
+    def hasDedicated(self, id: str):
+        return id is not None and id in self.__paths
+
+    # Utility function to get the IDs of the Curves that have a dedicated model
+    def getDedicatedIDs(self):
+        return [id for id in self.__paths if id is not None]
+
+    # Utility function to get the input window length of the dedicated model of a Curve or of the generic model in case id is None
+    def getTimesteps(self, id: str = None):
+        return self.__timesteps[id]
+
+    # Utility function to get the path of the dedicated model of a Curve or of the generic model in case id is None
+    def getPath(self, id: str = None):
+        return self.__paths[id]
+
+    # Utility function to get the dedicated model of a Curve or the generic model in case id is None
+    # A model is loaded the first time it is requested and is kept loaded until it is evicted
+    def getModel(self, id: str = None):
+        if id in self.__models:
+            self.__models.move_to_end(id)
+            self.__hits += 1
+            Metrics.count("modelHits")
+            return self.__models[id]
+
+        with Metrics.stage("loadModel"):
+            model = self.__load(self.__paths[id])
+        self.__loads += 1
+        Metrics.count("modelsLoaded")
+        self.__models[id] = model
+
+        if len(self.__models) > self.__capacity:
+            self.__models.popitem(last=False)
+
+        return model
+
+    # Utility function to get the number of times a model was loaded and the number of times a loaded model was reused
+    def getStatistics(self):
+        return {"loads": self.__loads, "hits": self.__hits}
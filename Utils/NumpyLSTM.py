@@ -0,0 +1,165 @@
+import numpy
+
+
+class NumpyLSTM:
+
+    # Static variable of the NumpyLSTM class that lists the supported precisions of the weights
+    __precisions = ["float32", "float16", "int8"]
+
+    @staticmethod
+    def getPrecisions():
+        return list(NumpyLSTM.__precisions)
+
+    # Utility static function to get the path of the exported weights of a SavedModel for a given precision
+    # e.g. Model.npz for float32 weights and Model.int8.npz for int8 weights
+    @staticmethod
+    def exportPath(modelPath: str, precision: str = "float32"):
+        if precision == "float32":
+            return modelPath + ".npz"
+        return modelPath + "." + precision + ".npz"
+
+    # Utility static function to quantize a weight matrix with one scale per output channel (i.e. column)
+    # In case of int8 each column is mapped linearly onto [-127,127], in case of float16 the values are only rounded
+    @staticmethod
+    def quantize(weight: numpy.ndarray, precision: str):
+        if precision == "int8":
+            scale = numpy.max(numpy.abs(weight), axis=0) / 127.0
+            scale = numpy.where(scale > 0, scale, 1.0).astype("float32")
+            return numpy.clip(numpy.round(weight / scale), -127, 127).astype("int8"), scale
+        return weight.astype(precision), numpy.ones(weight.shape[1], dtype="float32")
+
+    # Utility static function to reverse NumpyLSTM.quantize
+    @staticmethod
+    def dequantize(weight: numpy.ndarray, scale: numpy.ndarray):
+        return weight.astype("float32") * scale
+
+    # Utility static function to compute the logistic sigmoid in a numerically stable way
+    @staticmethod
+    def sigmoid(x: numpy.ndarray):
+        return 0.5 * (numpy.tanh(0.5 * x) + 1.0)
+
+    # A stack of LSTM layers followed by a Dense layer, as in the following Keras model
+    #
+    # LSTM(64, return_sequences=True) -> Dropout -> LSTM(64, return_sequences=False) -> Dense(1)
+    #
+    # Each LSTM layer is a (kernel, recurrentKernel, bias) tuple with the gates in the Keras order (input, forget, cell, output)
+    # and the Dense layer is a (kernel, bias) tuple, the Dropout layers are omitted since they do nothing during inference
+    #
+    # In case precision is float16 or int8 the kernels of the LSTM layers are kept in that precision with one scale per output channel
+    # (see NumpyLSTM.quantize) and are only dequantized for the duration of a prediction, the biases and the Dense layer stay float32
+    def __init__(self, layers: list, dense: tuple, timesteps: int, precision: str = "float32", scales: list = None):
+        self.__precision = precision
+        self.__layers = [(numpy.asarray(kernel, dtype=precision), numpy.asarray(recurrentKernel, dtype=precision), numpy.asarray(bias, dtype="float32")) for kernel, recurrentKernel, bias in layers]
+        self.__scales = [(numpy.ones(layer[0].shape[1], dtype="float32"), numpy.ones(layer[1].shape[1], dtype="float32")) for layer in self.__layers] if scales is None else scales
+        self.__dense = tuple(numpy.asarray(weight, dtype="float32") for weight in dense)
+        self.__timesteps = int(timesteps)
+
+    # Utility function to create a copy of a float32 NumpyLSTM whose LSTM kernels are quantized to the provided precision
+    def quantized(self, precision: str):
+        layers = []
+        scales = []
+
+        for kernel, recurrentKernel, bias in self.__layers:
+            kernel, kernelScale = NumpyLSTM.quantize(kernel, precision)
+            recurrentKernel, recurrentScale = NumpyLSTM.quantize(recurrentKernel, precision)
+            layers.append((kernel, recurrentKernel, bias))
+            scales.append((kernelScale, recurrentScale))
+
+        return NumpyLSTM(layers, self.__dense, self.__timesteps, precision, scales)
+
+    # Utility static function to extract the weights of a Keras model, i.e. one that was loaded from a SavedModel
+    @staticmethod
+    def fromKeras(model):
+        layers = []
+        dense = None
+
+        for layer in model.layers:
+            if type(layer).__name__ == "LSTM":
+                layers.append(tuple(layer.get_weights()))
+            elif type(layer).__name__ == "Dense":
+                dense = tuple(layer.get_weights())
+
+        return NumpyLSTM(layers, dense, model.input_shape[1])
+
+    # Utility static function to load the weights that were stored with NumpyLSTM.save
+    # Weights that were stored without a precision are float32 weights without scales
+    @staticmethod
+    def load(filePath: str):
+        with numpy.load(filePath) as weights:
+            layers = [(weights["kernel{}".format(i)], weights["recurrentKernel{}".format(i)], weights["bias{}".format(i)]) for i in range(int(weights["layers"]))]
+            if "precision" not in weights:
+                return NumpyLSTM(layers, (weights["denseKernel"], weights["denseBias"]), int(weights["timesteps"]))
+            scales = [(weights["kernelScale{}".format(i)], weights["recurrentScale{}".format(i)]) for i in range(int(weights["layers"]))]
+            return NumpyLSTM(layers, (weights["denseKernel"], weights["denseBias"]), int(weights["timesteps"]), str(weights["precision"]), scales)
+
+    # Utility function to store the weights of a NumpyLSTM as a compressed .npz file
+    def save(self, filePath: str):
+        weights = {"layers": len(self.__layers), "timesteps": self.__timesteps, "precision": self.__precision, "denseKernel": self.__dense[0], "denseBias": self.__dense[1]}
+
+        for i, ((kernel, recurrentKernel, bias), (kernelScale, recurrentScale)) in enumerate(zip(self.__layers, self.__scales)):
+            weights["kernel{}".format(i)] = kernel
+            weights["recurrentKernel{}".format(i)] = recurrentKernel
+            weights["bias{}".format(i)] = bias
+            weights["kernelScale{}".format(i)] = kernelScale
+            weights["recurrentScale{}".format(i)] = recurrentScale
+
+        numpy.savez_compressed(filePath, **weights)
+
+    # Utility function to run a single LSTM layer over a (batch,timesteps,features) array
+    # The input projection of every timestep is computed with a single matrix multiplication before the recurrence
+    @staticmethod
+    def __lstm(x: numpy.ndarray, kernel: numpy.ndarray, recurrentKernel: numpy.ndarray, bias: numpy.ndarray, returnSequences: bool):
+        units = recurrentKernel.shape[0]
+        projections = numpy.matmul(x, kernel) + bias
+        h = numpy.zeros((x.shape[0], units), dtype="float32")
+        c = numpy.zeros((x.shape[0], units), dtype="float32")
+        sequences = numpy.empty((x.shape[0], x.shape[1], units), dtype="float32") if returnSequences else None
+
+        for t in range(x.shape[1]):
+            z = projections[:, t] + numpy.matmul(h, recurrentKernel)
+            i = NumpyLSTM.sigmoid(z[:, :units])
+            f = NumpyLSTM.sigmoid(z[:, units:2 * units])
+            g = numpy.tanh(z[:, 2 * units:3 * units])
+            o = NumpyLSTM.sigmoid(z[:, 3 * units:])
+            c = f * c + i * g
+            h = o * numpy.tanh(c)
+            if returnSequences:
+                sequences[:, t] = h
+
+        return sequences if returnSequences else h
+
+    # Utility function to make a prediction for a (batch,timesteps,1) array of windows
+    # The signature matches the one of the Keras model.predict() method, the batch is processed in chunks of batch_size windows
+    def predict(self, x: numpy.ndarray, batch_size: int = 4096, verbose: int = 0):
+        x = numpy.asarray(x, dtype="float32")
+        predictions = numpy.empty((x.shape[0], self.__dense[0].shape[1]), dtype="float32")
+        layers = self.__layers
+
+        if self.__precision != "float32":
+            layers = [(NumpyLSTM.dequantize(kernel, kernelScale), NumpyLSTM.dequantize(recurrentKernel, recurrentScale), bias)
+                      for (kernel, recurrentKernel, bias), (kernelScale, recurrentScale) in zip(self.__layers, self.__scales)]
+
+        for start in range(0, x.shape[0], batch_size):
+            h = x[start:start + batch_size]
+            for j, (kernel, recurrentKernel, bias) in enumerate(layers):
+                h = NumpyLSTM.__lstm(h, kernel, recurrentKernel, bias, returnSequences=j < len(layers) - 1)
+            predictions[start:start + batch_size] = numpy.matmul(h, self.__dense[0]) + self.__dense[1]
+
+        return predictions
+
+    def getLayers(self):
+        return self.__layers
+
+    def getDense(self):
+        return self.__dense
+
+    def getTimesteps(self):
+        return self.__timesteps
+
+    def getPrecision(self):
+        return self.__precision
+
+    # Utility function to get the number of bytes that the weights of a NumpyLSTM occupy
+    def getSize(self):
+        weights = [weight for layer in self.__layers for weight in layer] + [scale for scales in self.__scales for scale in scales] + list(self.__dense)
+        return sum(weight.nbytes for weight in weights)
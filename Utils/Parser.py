@@ -1,22 +1,215 @@
+import itertools
+import json
 import os
+import numpy
 import pandas
+from Utils import Metrics
 from Utils.Curve import Curve
+from Utils.CurveSet import CurveSet
 
 
-# Utility function to parse a CSV file and create the appropriate list of Curves
-def parse(filePath: str, delimiter: str = '\t'):
+# Utility function to get the paths of the binary cache of a CSV file, that is
+# - The values of every Curve as a float32 .npy matrix
+# - The IDs, the length and the min/max of every Curve and the signature of the CSV file the cache was built from as JSON
+def cachePaths(filePath: str):
+    return filePath + ".cache.npy", filePath + ".cache.json"
 
-    if os.stat(filePath).st_size == 0 or not filePath.lower().endswith(".csv"):
-        print("Error : File {} is either empty or does not have the .csv extension".format(filePath))
+
+# The version of the format of the cache, a cache of an older version is stale
+# Version 2 caches record the actual length of every row of a CSV file whose rows have different lengths
+# Version 3 caches skip the rows that hold an ID but no values
+_cacheVersion = 3
+
+
+# Utility function to get the signature of a file that is used to invalidate its cache
+def _signature(filePath: str, delimiter: str):
+    status = os.stat(filePath)
+    return {"mtime": status.st_mtime_ns, "size": status.st_size, "delimiter": delimiter, "version": _cacheVersion}
+
+
+# Utility function to memory-map the cache of a CSV file
+# In case the cache does not exist or is stale None is returned
+def _loadCache(filePath: str, delimiter: str):
+    valuesPath, indexPath = cachePaths(filePath)
+
+    try:
+        with open(indexPath, "r") as indexFile:
+            index = json.load(indexFile)
+        if index["signature"] != _signature(filePath, delimiter):
+            return None
+        values = numpy.load(valuesPath, mmap_mode="r")
+    except (OSError, ValueError, KeyError):
+        return None
+
+    return CurveSet(index["ids"], values, numpy.array(index["mins"], dtype="float32"), numpy.array(index["maxs"], dtype="float32"), index["lengths"])
+
+
+# Utility function to store the cache of a CSV file next to it
+# Both files are written under a temporary name first so that a cache is never read half-written
+# The cache is an optimisation, hence in case it can not be written the error is ignored
+def _storeCache(filePath: str, delimiter: str, curves: CurveSet):
+    valuesPath, indexPath = cachePaths(filePath)
+    index = {
+        "signature": _signature(filePath, delimiter),
+        "ids": curves.getIDs(),
+        "lengths": curves.getLengths().tolist(),
+        "mins": curves.getMins()[:, 0].tolist(),
+        "maxs": curves.getMaxs()[:, 0].tolist()
+    }
+
+    try:
+        with open(valuesPath + ".tmp", "wb") as valuesFile:
+            numpy.save(valuesFile, curves.getValues())
+        os.replace(valuesPath + ".tmp", valuesPath)
+        with open(indexPath + ".tmp", "w") as indexFile:
+            json.dump(index, indexFile)
+        os.replace(indexPath + ".tmp", indexPath)
+    except OSError:
+        pass
+
+
+# Utility function to split a line of a CSV file into the ID and the values of a Curve
+def _parseLine(line: str, delimiter: str):
+    id, values = line.rstrip("\r\n").split(delimiter, 1)
+    return id, numpy.fromstring(values, dtype="float32", sep=delimiter)
+
+
+# Utility function to read the lines of a CSV file in chunks of at most chunkSize rows
+# The blank lines and the lines that hold an ID but no values are skipped, as parse does
+def _chunks(filePath: str, delimiter: str, chunkSize: int):
+    with open(filePath, "r") as file:
+        while True:
+            lines = list(itertools.islice(file, chunkSize))
+            if len(lines) == 0:
+                break
+            chunk = [line for line in lines if line.rstrip("\r\n").partition(delimiter)[2].strip()]
+            if len(chunk) > 0:
+                yield chunk
+
+
+# Utility function to stream the Curves of a CSV file one at a time, reading the file in chunks of chunkSize rows
+# The rows of the file may have different lengths and only a single chunk of the file is held in memory at any given moment
+def stream(filePath: str, delimiter: str = '\t', chunkSize: int = 1024):
+    for chunk in _chunks(filePath, delimiter, chunkSize):
+        for line in chunk:
+            id, values = _parseLine(line, delimiter)
+            yield Curve(id, values, copy=False)
+
+
+# Utility function to parse a CSV file in chunks of chunkSize rows directly into a preallocated float32 matrix
+# A first pass over the file counts the rows and their lengths, a second pass fills the matrix
+# The rows of the file may have different lengths (see CurveSet)
+def _parseChunked(filePath: str, delimiter: str, chunkSize: int):
+    lengths = []
+    for chunk in _chunks(filePath, delimiter, chunkSize):
+        lengths.extend(line.rstrip("\r\n").count(delimiter) for line in chunk)
+
+    values = numpy.full((len(lengths), max(lengths, default=0)), numpy.nan, dtype="float32")
+    mins = numpy.empty(len(lengths), dtype="float32")
+    maxs = numpy.empty(len(lengths), dtype="float32")
+    ids = []
+
+    for row, curve in enumerate(stream(filePath, delimiter, chunkSize)):
+        values[row, :len(curve)] = curve.getValues()
+        mins[row] = curve.getMin()
+        maxs[row] = curve.getMax()
+        lengths[row] = len(curve)
+        ids.append(curve.getID())
+
+    return CurveSet(ids, values, mins, maxs, lengths)
+
+
+# Utility function to create a CurveSet from a list of Curves, a CurveSet is returned as is
+def _asCurveSet(curves):
+    if isinstance(curves, CurveSet):
+        return curves
+
+    lengths = numpy.array([len(curve) for curve in curves], dtype=int)
+    values = numpy.full((len(curves), max(lengths, default=0)), numpy.nan, dtype="float32")
+    for row, curve in enumerate(curves):
+        values[row, :len(curve)] = curve.getValues()
+
+    return CurveSet([curve.getID() for curve in curves], values, [curve.getMin() for curve in curves], [curve.getMax() for curve in curves], lengths)
+
+
+# Utility function to write a list of Curves or a CurveSet to a CSV file that parse can read, with one Curve per line as Curve.toCSV formats it
+# The values are converted to text chunkSize rows at a time by NumPy and every chunk is written with a single call through a buffer of bufferSize bytes
+def writeCSV(curves, filePath: str, delimiter: str = "\t", chunkSize: int = 32, bufferSize: int = 2 ** 20):
+    curves = _asCurveSet(curves)
+    ids = curves.getIDs()
+    values = curves.getValues()
+    lengths = curves.getLengths()
+
+    with open(filePath, "w", buffering=bufferSize) as file:
+        for start in range(0, len(curves), chunkSize):
+            rows = values[start:start + chunkSize].astype(str).tolist()
+            if curves.isRagged():
+                rows = [row[:length] for row, length in zip(rows, lengths[start:start + chunkSize])]
+            file.write("".join(id + delimiter + delimiter.join(row) + "\n" for id, row in zip(ids[start:start + chunkSize], rows)))
+
+
+# Utility function to write a list of Curves or a CurveSet to a compressed binary .npz file that parse (or readNPZ) can read
+# The file holds the IDs, the values, the lengths and the min/max of every Curve, hence reading it involves no text parsing
+def writeNPZ(curves, filePath: str):
+    curves = _asCurveSet(curves)
+    numpy.savez_compressed(filePath, ids=numpy.array(curves.getIDs(), dtype=str), values=curves.getValues(), lengths=curves.getLengths(), mins=curves.getMins()[:, 0], maxs=curves.getMaxs()[:, 0])
+
+
+# Utility function to read the CurveSet of a .npz file that was written by writeNPZ
+def readNPZ(filePath: str):
+    with numpy.load(filePath) as curves:
+        return CurveSet(curves["ids"].tolist(), curves["values"], curves["mins"], curves["maxs"], curves["lengths"])
+
+
+# Utility function to parse a CSV file and create the appropriate CurveSet
+# In case the file has the .npz extension it is read as a binary file instead (see writeNPZ)
+# In case cache is True the parsed values are stored in a binary cache next to the CSV file (see cachePaths)
+# and every later call memory-maps that cache instead of parsing the CSV file, until the file is modified
+# In case chunkSize is provided the file is read in chunks of chunkSize rows, that may have different lengths (see stream)
+def parse(filePath: str, delimiter: str = '\t', cache: bool = True, chunkSize: int = None):
+
+    if os.stat(filePath).st_size == 0 or not filePath.lower().endswith((".csv", ".npz")):
+        print("Error : File {} is either empty or does not have the .csv or the .npz extension".format(filePath))
         return []
 
-    dataFrame = pandas.read_csv(filePath, delimiter, header=None)
-    dataSet = dataFrame.values
-    ids = dataSet[:, 0]
-    dataSet = dataSet[:, 1:]
-    dataSet = dataSet.astype('float32')
-    curves = []
-    for i in range(0, dataSet.shape[0]):
-        curve = Curve(ids[i], dataSet[i, :])
-        curves.append(curve)
+    if filePath.lower().endswith(".npz"):
+        curves = readNPZ(filePath)
+        Metrics.count("curves", len(curves))
+        return curves
+
+    if cache:
+        curves = _loadCache(filePath, delimiter)
+        if curves is not None:
+            Metrics.count("parseCacheHits")
+            Metrics.count("curves", len(curves))
+            return curves
+        Metrics.count("parseCacheMisses")
+
+    if chunkSize is not None:
+        curves = _parseChunked(filePath, delimiter, chunkSize)
+    else:
+        # pandas pads the rows that are shorter than the first one with NaN, hence the length of every row is the position of its last value
+        # The rows that hold an ID but no values are skipped, as in stream
+        # In case a later row is longer than the first one pandas can not parse the file and it is parsed in chunks instead
+        try:
+            dataFrame = pandas.read_csv(filePath, delimiter=delimiter, header=None)
+        except pandas.errors.ParserError:
+            dataFrame = None
+
+        if dataFrame is None:
+            curves = _parseChunked(filePath, delimiter, 1024)
+        else:
+            dataSet = dataFrame.values
+            ids = dataSet[:, 0]
+            dataSet = dataSet[:, 1:]
+            dataSet = dataSet.astype('float32')
+            present = ~numpy.isnan(dataSet)
+            lengths = numpy.where(present.any(axis=1), dataSet.shape[1] - numpy.argmax(present[:, ::-1], axis=1), 0)
+            rows = lengths > 0
+            curves = CurveSet(ids[rows], dataSet[rows], lengths=lengths[rows])
+
+    if cache:
+        _storeCache(filePath, delimiter, curves)
+
+    Metrics.count("curves", len(curves))
     return curves
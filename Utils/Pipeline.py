@@ -0,0 +1,73 @@
+import numpy
+import tensorflow
+
+
+# Utility function to determine the [start,stop) range of windows of each Curve that lies within the global [first,last) range
+# Windows are numbered in the same order as the rows that Curve.sampleSet would produce for the same arguments
+def _segments(dataset: list, timesteps: int, length: int, first: int, last: int):
+    segments = []
+    offset = 0
+
+    for i in range(len(dataset)):
+        windows = max(0, min(length, len(dataset[i])) - timesteps)
+        start = max(first - offset, 0)
+        stop = min(last - offset, windows)
+        if start < stop:
+            segments.append((i, start, stop))
+        offset += windows
+
+    return segments
+
+
+# Utility function that yields the windows of each segment one Curve at a time
+# Only the values of a single Curve are normalised and windowed at any given moment
+def _generator(dataset: list, segments: list, timesteps: int, length: int, front: bool, normalise: bool, a: float, b: float, generator: numpy.random.Generator = None):
+    order = numpy.arange(len(segments))
+
+    if generator is not None:
+        generator.shuffle(order)
+
+    for j in order:
+        i, start, stop = segments[j]
+        x, y = dataset[i].sample(timesteps, length, front, includeY=True, normalise=normalise, a=a, b=b, materialise=False)
+        yield numpy.asarray(x[start:stop], dtype="float32"), numpy.asarray(y[start:stop], dtype="float32")
+
+
+# Utility function to create the tf.data input pipelines of a set of Curves without materialising every window in memory
+#
+# The pipelines produce the same windows as Curve.sampleSet with the same arguments and the validation set
+# is held out in the same way as the validation_split argument of model.fit(), that is the last windows are held out
+#
+# The training windows are shuffled with a bounded buffer, the order of the Curves is also shuffled on every epoch
+# In case validationSplit is 0 the validation pipeline is None
+def streamSet(dataset: list, timesteps: int, length: int, front: bool, normalise: bool, batchSize: int, validationSplit: float = 0.0, shuffleBuffer: int = 4096, a: float = 0.0, b: float = 1.0, seed: int = None):
+
+    if length <= 0 or length > len(dataset[0]):
+        length = len(dataset[0])
+
+    total = sum(max(0, min(length, len(curve)) - timesteps) for curve in dataset)
+    splitAt = int(numpy.floor(total * (1.0 - validationSplit)))
+
+    signature = (tensorflow.TensorSpec(shape=(None, timesteps, 1), dtype=tensorflow.float32),
+                 tensorflow.TensorSpec(shape=(None, 1), dtype=tensorflow.float32))
+
+    trainSegments = _segments(dataset, timesteps, length, 0, splitAt)
+    generator = numpy.random.default_rng(seed)
+
+    trainDataset = tensorflow.data.Dataset.from_generator(lambda: _generator(dataset, trainSegments, timesteps, length, front, normalise, a, b, generator), output_signature=signature)
+    trainDataset = trainDataset.unbatch()
+    trainDataset = trainDataset.shuffle(shuffleBuffer, seed=seed, reshuffle_each_iteration=True)
+    trainDataset = trainDataset.batch(batchSize)
+    trainDataset = trainDataset.prefetch(tensorflow.data.AUTOTUNE)
+
+    if splitAt >= total:
+        return trainDataset, None
+
+    validationSegments = _segments(dataset, timesteps, length, splitAt, total)
+
+    validationDataset = tensorflow.data.Dataset.from_generator(lambda: _generator(dataset, validationSegments, timesteps, length, front, normalise, a, b), output_signature=signature)
+    validationDataset = validationDataset.unbatch()
+    validationDataset = validationDataset.batch(batchSize)
+    validationDataset = validationDataset.prefetch(tensorflow.data.AUTOTUNE)
+
+    return trainDataset, validationDataset
@@ -0,0 +1,93 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy
+import pandas
+from matplotlib import pyplot
+
+# The extensions of the file formats that are supported by write()
+FORMATS = [".csv", ".parquet", ".npz"]
+
+
+# Utility function to draw the predictions of one or more models for a Curve, one subplot per model
+# Each prediction is a (label, start, prediction, mse) tuple, where start is the index of the first predicted value
+# Predicted values past the end of the Curve (i.e. forecasts) are drawn after its last value
+def plot(id: str, values: numpy.ndarray, predictions: list):
+    figure, axes = pyplot.subplots(len(predictions), squeeze=False)
+    xAxis = numpy.arange(len(values))
+
+    for axis, (label, start, prediction, mse) in zip(axes[:, 0], predictions):
+        if numpy.isnan(mse):
+            axis.set_title("Horizon : {} steps".format(len(prediction)))
+        else:
+            axis.set_title("MSE : {:.2e}".format(mse))
+        axis.plot(xAxis, values, label=id)
+        axis.plot(numpy.arange(start, start + len(prediction)), prediction, label=label)
+        axis.legend()
+
+    return figure
+
+
+# Utility function that is executed once by every worker process of renderSet()
+def _initialiseWorker():
+    pyplot.switch_backend("Agg")
+
+
+# Utility function to render the plot of a Curve as a PNG file
+def _render(arguments: tuple):
+    id, values, predictions, directory = arguments
+    figure = plot(id, values, predictions)
+    figure.savefig(os.path.join(directory, id + ".png"))
+    pyplot.close(figure)
+
+
+# Utility function to render the plots of a set of Curves as PNG files in a directory with a pool of worker processes
+# The plots are rendered with the non-interactive Agg backend, hence no display is required
+# Forecasts holds a list of predictions for each Curve of the set (see plot)
+def renderSet(curves: list, forecasts: list, directory: str, workers: int = None):
+    os.makedirs(directory, exist_ok=True)
+    arguments = [(curve.getID(), curve.getValues(), predictions, directory) for curve, predictions in zip(curves, forecasts)]
+
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"), initializer=_initialiseWorker) as executor:
+        for _ in executor.map(_render, arguments, chunksize=8):
+            pass
+
+
+# Utility function to create a columnar table out of the predictions of a set of Curves
+# Each row of the table corresponds to a single predicted value and holds the ID of the Curve, the label of the model,
+# the index and the actual value of the predicted point, the predicted value and the MSE of the model for the Curve
+# The actual value of a point past the end of the Curve (i.e. a forecast) is NaN
+def table(curves: list, forecasts: list):
+    columns = {"id": [], "model": [], "index": [], "actual": [], "prediction": [], "mse": []}
+
+    for curve, predictions in zip(curves, forecasts):
+        for label, start, prediction, mse in predictions:
+            columns["id"].append(numpy.full(len(prediction), curve.getID(), dtype=object))
+            columns["model"].append(numpy.full(len(prediction), label, dtype=object))
+            columns["index"].append(numpy.arange(start, start + len(prediction)))
+            actual = numpy.full(len(prediction), numpy.nan, dtype="float32")
+            known = curve.getValues()[start:start + len(prediction)]
+            actual[:len(known)] = known
+            columns["actual"].append(actual)
+            columns["prediction"].append(prediction)
+            columns["mse"].append(numpy.full(len(prediction), mse))
+
+    return {column: numpy.concatenate(values) if len(values) > 0 else numpy.array([]) for column, values in columns.items()}
+
+
+# Utility function to write a columnar table to a file
+# The format of the file is determined by its extension, that is one of .csv (tab-delimited), .parquet or .npz
+def write(columns: dict, filePath: str, delimiter: str = "\t"):
+    extension = os.path.splitext(filePath)[1].lower()
+
+    if extension == ".npz":
+        numpy.savez(filePath, **{column: values.astype(str) if values.dtype == object else values for column, values in columns.items()})
+    elif extension == ".csv":
+        pandas.DataFrame(columns).to_csv(filePath, sep=delimiter, index=False)
+    elif extension == ".parquet":
+        pandas.DataFrame(columns).to_parquet(filePath, index=False)
+    else:
+        print("Error : File {} should have one of the {} extensions".format(filePath, ", ".join(FORMATS)))
+        return False
+
+    return True
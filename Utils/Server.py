@@ -0,0 +1,246 @@
+import json
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import numpy
+from Utils.Curve import Curve
+from Utils.ModelRegistry import ModelRegistry
+
+
+# Utility function to summarise a sequence of measurements with its mean and its 50th, 99th percentiles
+def percentiles(values):
+    if len(values) == 0:
+        return {"count": 0, "mean": None, "p50": None, "p99": None, "max": None}
+
+    values = numpy.asarray(values, dtype=float)
+    return {"count": len(values), "mean": float(numpy.mean(values)), "p50": float(numpy.percentile(values, 50)), "p99": float(numpy.percentile(values, 99)), "max": float(numpy.max(values))}
+
+
+class Batcher:
+
+    # A single thread owns every model of the registry and makes all of the predictions
+    # The windows that are submitted concurrently are gathered for at most budget seconds (or until maxBatch windows are gathered)
+    # and the windows of each model are predicted with a single batched forward pass
+    #
+    # The last history batches are kept for the batch size statistics
+    def __init__(self, registry: ModelRegistry, budget: float = 0.005, maxBatch: int = 4096, history: int = 10000):
+        self.__registry = registry
+        self.__budget = budget
+        self.__maxBatch = max(1, maxBatch)
+        self.__queue = queue.Queue()
+        self.__batchSizes = deque(maxlen=history)
+        self.__thread = threading.Thread(target=self.__run, daemon=True)
+        self.__thread.start()
+
+    # Utility function to submit the normalised window of a model, the dedicated model of a Curve or the generic model in case id is None
+    # Returns a Future that resolves to the normalised prediction of the window
+    def submit(self, id: str, window: numpy.ndarray):
+        future = Future()
+        self.__queue.put((id, numpy.asarray(window, dtype="float32").reshape((-1, 1)), future))
+        return future
+
+    def stop(self):
+        self.__queue.put(None)
+        self.__thread.join()
+
+    # Utility function to gather the requests of a single batch, waiting at most budget seconds after the first one arrives
+    def __gather(self):
+        request = self.__queue.get()
+
+        if request is None:
+            return None
+
+        requests = [request]
+        deadline = time.perf_counter() + self.__budget
+
+        while len(requests) < self.__maxBatch:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                request = self.__queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if request is None:
+                self.__queue.put(None)
+                break
+            requests.append(request)
+
+        return requests
+
+    def __run(self):
+        while True:
+            requests = self.__gather()
+
+            if requests is None:
+                return
+
+            self.__batchSizes.append(len(requests))
+            groups = {}
+            for request in requests:
+                groups.setdefault(request[0], []).append(request)
+
+            for id, group in groups.items():
+                try:
+                    x = numpy.stack([window for _, window, _ in group])
+                    predictions = numpy.asarray(self.__registry.getModel(id).predict(x, batch_size=len(x), verbose=0), dtype="float32")[:, 0]
+                except Exception as exception:
+                    for _, _, future in group:
+                        future.set_exception(exception)
+                    continue
+
+                for (_, _, future), prediction in zip(group, predictions):
+                    future.set_result(float(prediction))
+
+    def getBatchSizes(self):
+        return list(self.__batchSizes)
+
+
+class ForecastServer:
+
+    # The model registry is loaded once and every request is served by the same Batcher
+    # In case curves is provided a request may refer to one of its Curves by ID instead of providing the prices
+    # The server only listens on the loopback interface (i.e. 127.0.0.1) by default
+    def __init__(self, registry: ModelRegistry, curves=None, host: str = "127.0.0.1", port: int = 8000, budget: float = 0.005, maxBatch: int = 4096, history: int = 10000):
+        self.__registry = registry
+        self.__curves = curves
+        self.__batcher = Batcher(registry, budget, maxBatch, history)
+        self.__latencies = deque(maxlen=history)
+        self.__lock = threading.Lock()
+        self.__server = _HTTPServer((host, port), _Handler)
+        self.__server.forecaster = self
+
+    # Utility function to serve a forecast request, given as a dictionary with the following keys :
+    # - id : The ID of a Curve, its dedicated model is used in case it has one and the generic model otherwise
+    # - values : The prices to forecast from, in case they are missing the prices of the Curve with the given ID are used
+    #            The prices are normalised with the min/max of the Curve with the given ID in case it is known and with their own min/max otherwise
+    # - horizon : The number of values to forecast, every value after the first one is forecast on the previous predictions (1 by default)
+    #
+    # Raises a ValueError in case the request is invalid and a RuntimeError in case the model fails to make a prediction
+    def forecast(self, request: dict):
+        start = time.perf_counter()
+        id = request.get("id")
+        values = request.get("values")
+        horizon = request.get("horizon", 1)
+
+        if id is not None:
+            id = str(id)
+
+        if values is None:
+            if id is None or self.__curves is None or id not in self.__curves:
+                raise ValueError("Either the prices or the ID of a known Curve should be provided")
+            curve = self.__curves[id]
+        else:
+            # The prices of a known Curve are normalised with the min/max of that Curve, as its training windows were,
+            # hence a known Curve gets the same forecast whether its prices are provided or not
+            # The prices of any other Curve can only be normalised with their own min/max
+            if id is not None and self.__curves is not None and id in self.__curves:
+                known = self.__curves[id]
+                minimum, maximum = known.getMin(), known.getMax()
+            else:
+                minimum, maximum = None, None
+            try:
+                curve = Curve(id, numpy.asarray(values, dtype="float32").reshape(-1), minimum, maximum)
+            except (TypeError, ValueError):
+                raise ValueError("The prices should be a list of numbers")
+
+        if not isinstance(horizon, int) or horizon < 1:
+            raise ValueError("The horizon should be a positive integer")
+
+        modelID = id if self.__registry.hasDedicated(id) else None
+        timesteps = self.__registry.getTimesteps(modelID)
+
+        if len(curve) < timesteps or numpy.any(numpy.isnan(curve.getValues()[-timesteps:])):
+            raise ValueError("At least {} prices should be provided".format(timesteps))
+
+        window = list(curve.normalise(curve.getValues()[-timesteps:]))
+        for _ in range(horizon):
+            try:
+                window.append(self.__batcher.submit(modelID, window[-timesteps:]).result())
+            except Exception as exception:
+                raise RuntimeError("The prediction failed : {}".format(exception)) from exception
+
+        latency = time.perf_counter() - start
+        with self.__lock:
+            self.__latencies.append(latency)
+
+        return {
+            "id": id,
+            "model": "Dedicated" if modelID is not None else "Generic",
+            "forecast": [float(value) for value in curve.denormalise(numpy.array(window[timesteps:], dtype="float32"))],
+            "latency": latency
+        }
+
+    # Utility function to get the latency (in seconds) statistics of the requests and the size statistics of the batches
+    def getStatistics(self):
+        with self.__lock:
+            latencies = list(self.__latencies)
+
+        return {"latency": percentiles(latencies), "batchSize": percentiles(self.__batcher.getBatchSizes()), "registry": self.__registry.getStatistics()}
+
+    def getAddress(self):
+        return self.__server.server_address
+
+    def serve(self):
+        try:
+            self.__server.serve_forever()
+        finally:
+            self.__server.server_close()
+            self.__batcher.stop()
+
+    def shutdown(self):
+        self.__server.shutdown()
+
+
+# The HTTP server of a ForecastServer, the backlog of pending connections is large enough for bursts of concurrent requests
+class _HTTPServer(ThreadingHTTPServer):
+    request_queue_size = 256
+    daemon_threads = True
+
+
+# The request handler of a ForecastServer
+# - POST /forecast : Serves a forecast request given as a JSON object (see ForecastServer.forecast)
+# - GET /stats : Returns the latency and batch size statistics (see ForecastServer.getStatistics)
+# - GET /health : Returns whether the server is up
+class _Handler(BaseHTTPRequestHandler):
+
+    def __reply(self, status: int, body: dict):
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        if self.path == "/stats":
+            self.__reply(200, self.server.forecaster.getStatistics())
+        elif self.path == "/health":
+            self.__reply(200, {"status": "ok"})
+        else:
+            self.__reply(404, {"error": "Unknown path {}".format(self.path)})
+
+    def do_POST(self):
+        if self.path != "/forecast":
+            self.__reply(404, {"error": "Unknown path {}".format(self.path)})
+            return
+
+        # An invalid request is answered with 400 and any other failure (e.g. of the model) with 500, so that the client always gets a response
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length).decode("utf-8"))
+            if not isinstance(request, dict):
+                raise ValueError("The request should be a JSON object")
+            status, body = 200, self.server.forecaster.forecast(request)
+        except ValueError as error:
+            status, body = 400, {"error": str(error)}
+        except Exception as error:
+            status, body = 500, {"error": str(error)}
+
+        self.__reply(status, body)
+
+    def log_message(self, format, *args):
+        pass
@@ -0,0 +1,90 @@
+import itertools
+import os
+import random
+import time
+import numpy
+from Utils.CurveSet import CurveSet
+
+# The parameters of a sweep and their values in forecastTrain.py
+DEFAULTS = {"timesteps": 10, "batchSize": 64, "epochs": 10, "units": 64, "trainPercent": 0.8}
+
+
+# Utility function to create every configuration of a search space, where each parameter maps to a list of values
+# The parameters that are missing from the search space take their value from DEFAULTS
+def grid(space: dict):
+    parameters = list(space.keys())
+    configurations = []
+
+    for values in itertools.product(*[space[parameter] for parameter in parameters]):
+        configuration = dict(DEFAULTS)
+        configuration.update(zip(parameters, values))
+        configurations.append(configuration)
+
+    return configurations
+
+
+# Utility function to draw trials distinct configurations of a search space at random (see grid)
+def randomSearch(space: dict, trials: int, seed: int = 123):
+    configurations = grid(space)
+    random.Random(seed).shuffle(configurations)
+    return configurations[:trials]
+
+
+class SweepWindowStore:
+
+    # The windows of a CurveSet are built once for every (timesteps, length, normalise) key and are stored as .npy files in directory,
+    # so that every worker process of a sweep memory-maps the same arrays instead of building its own
+    def __init__(self, curves: CurveSet, directory: str):
+        self.__curves = curves
+        self.__directory = directory
+        self.__paths = {}
+        self.__hits = 0
+        os.makedirs(directory, exist_ok=True)
+
+    # Utility function to get the paths of the X and Y .npy files of a key, the windows are built in case they do not exist yet
+    def get(self, timesteps: int, length: int, normalise: bool = True):
+        key = (timesteps, length, normalise)
+
+        if key in self.__paths:
+            self.__hits += 1
+            return self.__paths[key]
+
+        name = "windows-{}-{}-{}".format(timesteps, length, int(normalise))
+        xPath = os.path.join(self.__directory, name + ".x.npy")
+        yPath = os.path.join(self.__directory, name + ".y.npy")
+
+        x, y = self.__curves.sample(timesteps, length=length, front=True, includeY=True, normalise=normalise)
+        numpy.save(xPath, x)
+        numpy.save(yPath, y)
+
+        self.__paths[key] = (xPath, yPath)
+        return self.__paths[key]
+
+    # Utility function to get the number of keys that were built and the number of times a built key was reused
+    def getStatistics(self):
+        return {"builds": len(self.__paths), "hits": self.__hits}
+
+
+# Utility function to train the model of a single configuration on the windows of a SweepWindowStore
+# The training stops early in case the validation loss does not improve for patience epochs
+# The function is meant to be executed in a worker process, hence it receives the paths of the windows instead of the windows
+def runTrial(configuration: dict, xPath: str, yPath: str, seed: int, threads: int = 1, patience: int = 3, validationSplit: float = 0.25):
+    import tensorflow
+    from Utils.Training import buildModel, experimentParameters
+
+    experimentParameters(seed, threads)
+    start = time.perf_counter()
+
+    xTrain = numpy.load(xPath, mmap_mode="r")
+    yTrain = numpy.load(yPath, mmap_mode="r")
+
+    model = buildModel(configuration["timesteps"], units=configuration["units"])
+    earlyStopping = tensorflow.keras.callbacks.EarlyStopping(monitor="val_loss", patience=patience, restore_best_weights=True)
+    fitSummary = model.fit(xTrain, yTrain, batch_size=configuration["batchSize"], epochs=configuration["epochs"], verbose=0, validation_split=validationSplit, callbacks=[earlyStopping])
+
+    result = dict(configuration)
+    result["validationLoss"] = float(numpy.min(fitSummary.history["val_loss"]))
+    result["loss"] = float(fitSummary.history["loss"][int(numpy.argmin(fitSummary.history["val_loss"]))])
+    result["epochsRun"] = len(fitSummary.history["loss"])
+    result["seconds"] = time.perf_counter() - start
+    return result
@@ -0,0 +1,23 @@
+import numpy
+from Utils.CurveSet import CurveSet
+
+
+# Utility function to generate count synthetic price Curves of at most length values as a CurveSet
+#
+# Every Curve is a geometric random walk that starts from a random price in [10,200) with daily returns drawn from N(drift,volatility)
+# In case ragged is greater than 0 the length of every Curve is drawn uniformly from [(1-ragged)*length,length] (see CurveSet)
+# The same seed always produces the same Curves
+def generate(count: int, length: int, ragged: float = 0.0, seed: int = 123, drift: float = 0.0002, volatility: float = 0.02):
+    generator = numpy.random.default_rng(seed)
+    starts = generator.uniform(10.0, 200.0, size=(count, 1))
+    returns = generator.normal(drift, volatility, size=(count, length - 1))
+    values = (starts * numpy.exp(numpy.concatenate([numpy.zeros((count, 1)), numpy.cumsum(returns, axis=1)], axis=1))).astype("float32")
+
+    lengths = None
+    if ragged > 0.0:
+        lengths = generator.integers(max(2, int((1.0 - ragged) * length)), length + 1, size=count)
+        lengths[0] = length
+        values[numpy.arange(length) >= lengths[:, numpy.newaxis]] = numpy.nan
+
+    return CurveSet(["synthetic{}".format(i) for i in range(count)], values, lengths=lengths)
+
@@ -0,0 +1,141 @@
+import json
+import os
+import random
+import time
+import numpy
+import tensorflow
+from tensorflow.keras.layers import LSTM, Dropout, Dense
+from tensorflow.keras.models import Sequential
+from Utils.Curve import Curve
+
+
+# Utility function to ensure the reproducibility of the results
+# The function's functionality is described in the following link :
+# - https://keras.io/getting_started/faq/#how-can-i-obtain-reproducible-results-using-keras-during-development
+#
+# The intra-op parallelism of TensorFlow is limited to the provided number of threads, that are used in a deterministic way
+def experimentParameters(seed: int = 123, threads: int = 1):
+    os.environ['PYTHONHASHSEED'] = str(seed)
+    random.seed(seed)
+    tensorflow.random.set_seed(seed)
+    numpy.random.seed(seed)
+    os.environ['TF_DETERMINISTIC_OPS'] = '1'
+    os.environ['TF_CUDNN_DETERMINISTIC'] = '1'
+    tensorflow.config.threading.set_inter_op_parallelism_threads(1)
+    tensorflow.config.threading.set_intra_op_parallelism_threads(threads)
+
+
+# Utility function to determine whether the CPU supports bfloat16 instructions (i.e. AVX512-BF16 or AMX-BF16)
+def supportsBfloat16():
+    try:
+        with open("/proc/cpuinfo", "r") as cpuinfoFile:
+            flags = cpuinfoFile.read().split()
+    except OSError:
+        return False
+    return "avx512_bf16" in flags or "amx_bf16" in flags
+
+
+# Utility function to favour the training throughput over the reproducibility of the results
+#
+# TensorFlow uses every available thread and non-deterministic ops, hence the results are only approximately reproducible
+# In case bfloat16 is True and the CPU supports it the layers compute in bfloat16 while keeping their variables in float32
+# Returns whether bfloat16 is used
+def performanceParameters(seed: int = 123, bfloat16: bool = False):
+    os.environ['PYTHONHASHSEED'] = str(seed)
+    random.seed(seed)
+    tensorflow.random.set_seed(seed)
+    numpy.random.seed(seed)
+    os.environ.pop('TF_DETERMINISTIC_OPS', None)
+    os.environ.pop('TF_CUDNN_DETERMINISTIC', None)
+    tensorflow.config.threading.set_inter_op_parallelism_threads(0)
+    tensorflow.config.threading.set_intra_op_parallelism_threads(0)
+
+    if bfloat16 and supportsBfloat16():
+        tensorflow.keras.mixed_precision.set_global_policy("mixed_bfloat16")
+        return True
+
+    return False
+
+
+# Keras callback that reports the number of training samples processed per second on every epoch
+# Keras validates the model before it ends an epoch, hence the clock of an epoch stops once its validation begins
+class ThroughputCallback(tensorflow.keras.callbacks.Callback):
+
+    def __init__(self, samples: int):
+        super().__init__()
+        self.__samples = samples
+        self.__start = None
+        self.__end = None
+        self.__throughputs = []
+
+    def on_epoch_begin(self, epoch, logs=None):
+        self.__start = time.perf_counter()
+        self.__end = None
+
+    def on_test_begin(self, logs=None):
+        if self.__start is not None and self.__end is None:
+            self.__end = time.perf_counter()
+
+    def on_epoch_end(self, epoch, logs=None):
+        end = self.__end if self.__end is not None else time.perf_counter()
+        throughput = self.__samples / (end - self.__start)
+        self.__throughputs.append(throughput)
+        print("Epoch {} : {:.0f} samples/sec".format(epoch + 1, throughput))
+
+    def getThroughputs(self):
+        return self.__throughputs
+
+
+# Utility function to create the LSTM model of the project
+# In case jit is True the model is compiled with XLA
+# The output layer always computes in float32, so that the loss is not computed in bfloat16 (see performanceParameters)
+def buildModel(timesteps: int, features: int = 1, units: int = 64, jit: bool = False):
+    model = Sequential()
+    model.add(LSTM(units, return_sequences=True, input_shape=(timesteps, features)))
+    model.add(Dropout(0.1))
+    model.add(LSTM(units, return_sequences=False))
+    model.add(Dense(features, dtype="float32"))
+    model.compile(optimizer='adam', loss='mse', jit_compile=jit)
+    return model
+
+
+# Utility function to train the dedicated model of a single Curve and store it in the directory/<ID> directory
+#
+# The model is trained on the first trainPercent of the values of the Curve in the same way as forecastTrain.py trains the generic model
+# and is stored as a SavedModel (i.e. directory/<ID>/Model) along with the parameters and the results of the training (i.e. directory/<ID>/metadata.json)
+# The function is meant to be executed in a worker process, hence it receives the values of the Curve instead of the Curve itself
+def trainDedicated(id: str, values: numpy.ndarray, timesteps: int, directory: str, seed: int, threads: int = 1, epochs: int = 10, batchSize: int = 64, validationSplit: float = 0.25, trainPercent: float = 0.8):
+    experimentParameters(seed, threads)
+    start = time.perf_counter()
+
+    curve = Curve(id, values)
+    trainLength = int(trainPercent * len(curve))
+    xTrain, yTrain = curve.sample(timesteps, length=trainLength, front=True, includeY=True, normalise=True)
+
+    model = buildModel(timesteps)
+    fitSummary = model.fit(xTrain, yTrain, batch_size=batchSize, epochs=epochs, verbose=0, validation_split=validationSplit)
+
+    # The weights that were exported from a previous model (see forecastExport.py) no longer match the new model
+    os.makedirs(os.path.join(directory, id), exist_ok=True)
+    model.save(os.path.join(directory, id, "Model"))
+    for fileName in os.listdir(os.path.join(directory, id)):
+        if fileName.startswith("Model.") and fileName.endswith(".npz"):
+            os.remove(os.path.join(directory, id, fileName))
+
+    metadata = {
+        "id": id,
+        "timesteps": timesteps,
+        "seed": seed,
+        "epochs": epochs,
+        "batchSize": batchSize,
+        "validationSplit": validationSplit,
+        "trainLength": trainLength,
+        "loss": float(fitSummary.history["loss"][-1]),
+        "validationLoss": float(fitSummary.history["val_loss"][-1]) if "val_loss" in fitSummary.history else None,
+        "seconds": time.perf_counter() - start
+    }
+
+    with open(os.path.join(directory, id, "metadata.json"), "w") as metadataFile:
+        json.dump(metadata, metadataFile, indent=4)
+
+    return metadata
@@ -0,0 +1,140 @@
+import hashlib
+import json
+import os
+import zipfile
+import numpy
+from Utils import Metrics
+from Utils.CurveSet import CurveSet
+
+
+class WindowCache:
+
+    # The normalised windows of the Curves of a CSV file are stored in directory, one .npz file per Curve and window parameters,
+    # so that a later run over the same file loads them instead of normalising and sampling the Curves again
+    #
+    # Every entry is keyed by the SHA-256 hash of the content of the file, the ID of the Curve and the window parameters,
+    # hence an entry is never used once the file changes, even if its modification time does not
+    # The hash of the file is only recomputed when its modification time or its size changes (see hashes.json)
+    #
+    # At most capacity bytes of entries are kept, the least recently used entry is evicted first
+    def __init__(self, filePath: str, directory: str = "Window-Cache", capacity: int = 256 * 2 ** 20):
+        self.__directory = directory
+        self.__capacity = capacity
+        self.__hits = 0
+        self.__misses = 0
+        os.makedirs(directory, exist_ok=True)
+        self.__source = self.__contentHash(filePath)
+
+    # Utility function to get the SHA-256 hash of the content of a file
+    @staticmethod
+    def hash(filePath: str, chunkSize: int = 2 ** 20):
+        digest = hashlib.sha256()
+        with open(filePath, "rb") as file:
+            for chunk in iter(lambda: file.read(chunkSize), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    # Utility function to get the hash of the content of a file, reusing the hash of an earlier run in case the file was not modified since
+    def __contentHash(self, filePath: str):
+        hashesPath = os.path.join(self.__directory, "hashes.json")
+        status = os.stat(filePath)
+        signature = [status.st_mtime_ns, status.st_size]
+
+        try:
+            with open(hashesPath, "r") as hashesFile:
+                hashes = json.load(hashesFile)
+        except (OSError, ValueError):
+            hashes = {}
+
+        key = os.path.abspath(filePath)
+        if key in hashes and hashes[key]["signature"] == signature:
+            return hashes[key]["hash"]
+
+        hashes[key] = {"signature": signature, "hash": WindowCache.hash(filePath)}
+        self.__write(hashesPath, lambda file: file.write(json.dumps(hashes).encode("utf-8")))
+        return hashes[key]["hash"]
+
+    # Utility function to write a file under a temporary name first, so that an entry is never read half-written
+    # The cache is an optimisation, hence in case the file can not be written the error is ignored
+    @staticmethod
+    def __write(filePath: str, writer):
+        try:
+            with open(filePath + ".tmp", "wb") as file:
+                writer(file)
+            os.replace(filePath + ".tmp", filePath)
+        except OSError:
+            pass
+
+    def __entryPath(self, id: str, parameters: list):
+        key = json.dumps([self.__source, id] + parameters)
+        return os.path.join(self.__directory, hashlib.sha256(key.encode("utf-8")).hexdigest() + ".npz")
+
+    # Utility function to evict the least recently used entries until the entries fit in the capacity of the cache
+    def __evict(self):
+        entries = []
+        for fileName in os.listdir(self.__directory):
+            if fileName.endswith(".npz"):
+                status = os.stat(os.path.join(self.__directory, fileName))
+                entries.append((status.st_mtime_ns, status.st_size, fileName))
+
+        entries.sort()
+        size = sum(entry[1] for entry in entries)
+
+        for _, entrySize, fileName in entries:
+            if size <= self.__capacity:
+                break
+            try:
+                os.remove(os.path.join(self.__directory, fileName))
+            except OSError:
+                pass
+            size -= entrySize
+
+    # Utility function to get the windows of every Curve of a CurveSet as CurveSet.sample(...,includeY=True,...,materialise=True) does
+    # Every Curve has its own entry, along with its normalisation statistics (i.e. min/max) and its length, hence a set shares the entries
+    # of every Curve it has in common with an earlier set (e.g. another random selection of forecast.py) and only the missing Curves are sampled
+    # An entry whose statistics or length differ from the ones of its Curve (e.g. values were appended to it after parsing) is stale and is rebuilt
+    #
+    # Returns X, Y and the number of windows of each Curve
+    def windows(self, curves: CurveSet, timesteps: int, length: int, front: bool, normalise: bool, a: float = 0.0, b: float = 1.0):
+        parameters = [timesteps, length, front, normalise, a, b]
+        statistics = numpy.column_stack([curves.getMins()[:, 0], curves.getMaxs()[:, 0], curves.getLengths()]).astype("float64")
+        entryPaths = [self.__entryPath(id, parameters) for id in curves.getIDs()]
+        x = [None] * len(curves)
+        y = [None] * len(curves)
+
+        for i, entryPath in enumerate(entryPaths):
+            try:
+                with numpy.load(entryPath) as entry:
+                    if numpy.array_equal(entry["statistics"], statistics[i], equal_nan=True):
+                        x[i], y[i] = entry["x"], entry["y"]
+            except (OSError, ValueError, KeyError, EOFError, zipfile.BadZipFile):
+                pass
+            if x[i] is not None:
+                os.utime(entryPath)
+
+        missing = [i for i in range(len(curves)) if x[i] is None]
+        self.__hits += len(curves) - len(missing)
+        self.__misses += len(missing)
+        Metrics.count("windowCacheHits", len(curves) - len(missing))
+
+        # The missing Curves are sampled at once and every one of them is written to its own entry
+        if len(missing) > 0:
+            Metrics.count("windowCacheMisses", len(missing))
+            xMissing, yMissing = curves.select(missing).sample(timesteps, length, front, includeY=True, normalise=normalise, a=a, b=b, materialise=False)
+
+            for i, xCurve, yCurve in zip(missing, xMissing, yMissing):
+                x[i] = numpy.array(xCurve).reshape((-1, timesteps, 1))
+                y[i] = numpy.array(yCurve).reshape((-1, 1))
+                self.__write(entryPaths[i], lambda file: numpy.savez(file, x=x[i], y=y[i], statistics=statistics[i]))
+
+            self.__evict()
+
+        counts = numpy.array([len(block) for block in x], dtype=int)
+        x = numpy.concatenate(x) if len(x) > 0 else numpy.empty((0, timesteps, 1), dtype="float32")
+        y = numpy.concatenate(y) if len(y) > 0 else numpy.empty((0, 1), dtype="float32")
+
+        return x, y, counts
+
+    # Utility function to get the number of Curves whose windows were loaded from the cache and the number of Curves that were sampled
+    def getStatistics(self):
+        return {"hits": self.__hits, "misses": self.__misses}
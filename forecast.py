@@ -1,18 +1,31 @@
-import os.path
+import os
 import random
 import sys
-import numpy
 from matplotlib import pyplot
-from tensorflow.python.keras.models import load_model
+import numpy
+from Utils import Metrics
 from Utils.ArgumentParser import ArgumentParser
+from Utils.Horizon import forecastRecursive
+from Utils.Inference import predictSet
+from Utils.ModelRegistry import ModelRegistry
 from Utils.Parser import parse
+from Utils.Report import FORMATS, plot, renderSet, table, write
+from Utils.WindowCache import WindowCache
 
 if __name__ == '__main__':
 
     argumentParser = ArgumentParser()
     argumentParser.addArgument(argument="-d", type="path", mandatory=True)
-    argumentParser.addNumericArgument(argument="-n", type="int", floor=1, ceiling=359, mandatory=True)
+    argumentParser.addNumericArgument(argument="-n", type="int", floor=1, ceiling=359, mandatory=False)
     argumentParser.addArgument(argument="-m", type="bool", mandatory=False)
+    argumentParser.addArgument(argument="-o", type="str", mandatory=False)
+    argumentParser.addArgument(argument="-p", type="str", mandatory=False)
+    argumentParser.addNumericArgument(argument="-w", type="int", floor=1, mandatory=False)
+    argumentParser.addNumericArgument(argument="-f", type="int", floor=1, mandatory=False)
+    argumentParser.addArgument(argument="-e", type="str", mandatory=False)
+    argumentParser.addArgument(argument="-j", type="str", mandatory=False)
+    argumentParser.addArgument(argument="-c", type="str", mandatory=False)
+    argumentParser.addNumericArgument(argument="-z", type="int", floor=0, mandatory=False)
 
     if not argumentParser.parse(sys.argv):
         exit(1)
@@ -20,105 +33,115 @@ if __name__ == '__main__':
     path = argumentParser.getArgument("-d")
     n = argumentParser.getArgument("-n")
     manipulate = argumentParser.getArgument("-m")
+    output = argumentParser.getArgument("-o")
+    plots = argumentParser.getArgument("-p")
+    workers = argumentParser.getArgument("-w")
+    horizon = argumentParser.getArgument("-f")
+    engine = argumentParser.getArgument("-e")
+    summaryPath = argumentParser.getArgument("-j")
+    profilePath = argumentParser.getArgument("-c")
+    cacheSize = argumentParser.getArgument("-z")
 
     if manipulate is None:
         manipulate = False
 
-    curves = parse(path)
+    if engine is None:
+        engine = "keras"
+
+    if cacheSize is None:
+        cacheSize = 256
+
+    if engine not in ModelRegistry.getEngines():
+        print("Error : Argument -e should be one of {}".format(", ".join(ModelRegistry.getEngines())))
+        exit(1)
+
+    if output is not None and os.path.splitext(output)[1].lower() not in FORMATS:
+        print("Error : Argument -o should be the path of a file with one of the {} extensions".format(", ".join(FORMATS)))
+        exit(1)
+
+    # In case the -j or the -c parameter was provided every stage of the run is timed and the summary of the run is written as JSON to -j at exit
+    # (or to the standard output in case -j is "-" or missing) and in case -c was provided the run is also profiled with cProfile
+    if summaryPath is not None or profilePath is not None:
+        Metrics.enable("-" if summaryPath is None else summaryPath, profilePath)
+
+    with Metrics.stage("parse"):
+        curves = parse(path)
 
     if len(curves) == 0:
         exit(1)
 
+    # The normalised windows of every run are cached in the Window-Cache directory (at most -z MiB of them, 0 disables the cache)
+    # A later run over the same file, Curves and models loads them instead of sampling the Curves again
+    cache = WindowCache(path, capacity=cacheSize * 2 ** 20) if cacheSize > 0 else None
+
     # Select at random the indices of the Curves that will be plotted and a prediction will be made for them
+    # In case the -n parameter was not provided every Curve is selected
     indices = list(range(len(curves)))
     random.shuffle(indices)
-    indices = indices[:n]
+    if n is not None:
+        indices = indices[:n]
 
-    timesteps = 10
-    features = 1
-    modelPath = "Model"
-    model = load_model(modelPath)
+    # The generic model and every dedicated model are discovered once and loaded when they are first needed
+    # In case the -e parameter is "numpy" the exported weights of the models are used and TensorFlow is never imported
+    registry = ModelRegistry(engine=engine)
+    timesteps = registry.getTimesteps()
+    model = registry.getModel()
 
     predictionPercent = 0.2
     predictionLength = int(0.2 * len(curves[0]))
-    subplots = 2
 
     # In case the -m parameter was provided skew the randomly produced indices
     # so that the indices of the Curves with a dedicated model will be included
     if manipulate:
         for i in range(len(curves)):
             curve = curves[i]
-            if (curve.getID() == "leu" or curve.getID() == "aiv" or curve.getID() == "agn") and i not in indices:
+            if registry.hasDedicated(curve.getID()) and i not in indices:
                 indices.append(i)
         random.shuffle(indices)
 
-    for index in indices:
-
-        if subplots > 1:
-            subplots = 1
-
-        curve = curves[index]
-
-        #  In case the corresponding Curve has a dedicated model 2 subplots will be needed
-        if os.path.isdir("Dedicated-Models/" + curve.getID()):
-            subplots += 1
-
-        figure, axes = pyplot.subplots(subplots)
-        xAxis = numpy.arange(len(curve))
-
-        x, y = curve.sample(timesteps=timesteps, length=predictionLength, front=False, includeY=True, normalise=True)
-        x = numpy.reshape(x, (x.shape[0], timesteps, features))
-
-        # Model X makes a prediction Y
-        # Y gets denormalized
-        # Y gets reshaped to an 1D array
-        # Calculate the MSE using the model.evaluate() method
-        modelPrediction = model.predict(x)
-        modelPrediction = curve.denormalise(modelPrediction)
-        modelPrediction = modelPrediction[:, 0]
-        mse = model.evaluate(x, y, verbose=0)
-
-        if subplots == 1:
-            axes.set_title("MSE : {:.2e}".format(mse))
-            axes.plot(xAxis, curve.getValues(), label=curve.getID())
-            axes.plot(xAxis[len(curve) - predictionLength + timesteps:], modelPrediction, label="Prediction")
-
-        else:
-            axes[0].set_title("MSE : {:.2e}".format(mse))
-            axes[0].plot(xAxis, curve.getValues(), label=curve.getID())
-            axes[0].plot(xAxis[len(curve) - predictionLength + timesteps:], modelPrediction, label="Prediction")
-            axes[0].legend()
-
-        if subplots > 1:
-
-            dedicatedModel = load_model("Dedicated-Models/" + curve.getID() + "/Model")
-
-            dedicatedTimesteps = None
-
-            # Each of the following Curves has a dedicated model with a different number of timesteps
-            if curve.getID() == "aiv":
-                dedicatedTimesteps = 20
-            elif curve.getID() == "leu":
-                dedicatedTimesteps = 50
-            elif curve.getID() == "agn":
-                dedicatedTimesteps = 5
-
-            x, y = curve.sample(timesteps=dedicatedTimesteps, length=predictionLength, front=False, includeY=True, normalise=True)
-            x = numpy.reshape(x, (x.shape[0], dedicatedTimesteps, features))
-
-            # Dedicated Model X makes a prediction Y
-            # Y gets denormalized
-            # Y gets reshaped to an 1D array
-            # Calculate the MSE using the evaluate() method
-            dedicatedModelPrediction = dedicatedModel.predict(x)
-            dedicatedModelPrediction = curve.denormalise(dedicatedModelPrediction)
-            dedicatedModelPrediction = dedicatedModelPrediction[:, 0]
-            dedicatedMse = dedicatedModel.evaluate(x, y, verbose=0)
-
-            axes[1].set_title("MSE : {:.2e}".format(dedicatedMse))
-            axes[1].plot(xAxis, curve.getValues(), label=curve.getID())
-            axes[1].plot(xAxis[len(curve) - predictionLength + dedicatedTimesteps:], dedicatedModelPrediction, label="Dedicated Prediction")
-            axes[1].legend()
-
-        pyplot.legend()
-        pyplot.show()
+    # Model X makes a prediction Y for the windows of every selected Curve in a single batch
+    # Y gets denormalized and split into an 1D array per Curve
+    # The MSE of every Curve is calculated on the normalised values as the model.evaluate() method does
+    selected = curves.select(indices)
+    with Metrics.stage("predict"):
+        modelPredictions, mses = predictSet(model, selected, timesteps, predictionLength, cache=cache)
+
+    # Each Curve gets a list of (label, start, prediction, mse) tuples, one per model
+    forecasts = []
+    for i in range(len(selected)):
+        curve = selected[i]
+        forecasts.append([("Prediction", len(curve) - predictionLength + timesteps, modelPredictions[i], mses[i])])
+
+        # In case the corresponding Curve has a dedicated model it makes a prediction in the same way as Model X
+        # Each dedicated model has its own number of timesteps, as read from its saved signature
+        if registry.hasDedicated(curve.getID()):
+            dedicatedModel = registry.getModel(curve.getID())
+            dedicatedTimesteps = registry.getTimesteps(curve.getID())
+            with Metrics.stage("predictDedicated"):
+                dedicatedModelPredictions, dedicatedMses = predictSet(dedicatedModel, selected.select([i]), dedicatedTimesteps, predictionLength, cache=cache)
+            forecasts[i].append(("Dedicated Prediction", len(curve) - predictionLength + dedicatedTimesteps, dedicatedModelPredictions[0], dedicatedMses[0]))
+
+    # In case the -f parameter was provided Model X also forecasts the next values of every selected Curve, past its last value
+    # Each step of the forecast is a single batched prediction for every selected Curve
+    if horizon is not None:
+        with Metrics.stage("horizon"):
+            horizonForecasts = forecastRecursive(model, selected, timesteps, horizon)
+        for i in range(len(selected)):
+            forecasts[i].append(("Forecast", len(selected[i]), horizonForecasts[i], numpy.nan))
+
+    # In case the -o or the -p parameter was provided the forecasts are written to files and nothing is displayed
+    if output is not None:
+        with Metrics.stage("write"):
+            written = write(table(selected, forecasts), output)
+        if not written:
+            exit(1)
+
+    if plots is not None:
+        with Metrics.stage("render"):
+            renderSet(selected, forecasts, plots, workers)
+
+    if output is None and plots is None:
+        for i in range(len(selected)):
+            with Metrics.stage("plot"):
+                plot(selected[i].getID(), selected[i].getValues(), forecasts[i])
+            pyplot.show()
@@ -0,0 +1,92 @@
+import os
+import sys
+import time
+import numpy
+from Utils.ArgumentParser import ArgumentParser
+from Utils.Backtest import METRICS, backtest, columns
+from Utils.ModelRegistry import ModelRegistry
+from Utils.Parser import parse
+from Utils.Report import FORMATS, write
+from Utils.WindowCache import WindowCache
+
+
+# Utility function to print the mean of every metric over the given rows of a backtest
+def summary(label: str, metrics: dict, rows=slice(None)):
+    print("{} : MSE {:.4e} - MAE {:.4e} - MAPE {:.2%} - Directional Accuracy {:.2%} ({} Curves, {} Windows)".format(
+        label, *[numpy.nanmean(metrics[metric][rows]) for metric in METRICS], len(metrics["windows"][rows]), numpy.sum(metrics["windows"][rows])))
+
+
+if __name__ == '__main__':
+
+    argumentParser = ArgumentParser()
+    argumentParser.addArgument(argument="-d", type="path", mandatory=True)
+    argumentParser.addNumericArgument(argument="-k", type="int", floor=1, mandatory=False)
+    argumentParser.addNumericArgument(argument="-l", type="int", floor=1, mandatory=False)
+    argumentParser.addArgument(argument="-e", type="str", mandatory=False)
+    argumentParser.addArgument(argument="-o", type="str", mandatory=False)
+    argumentParser.addNumericArgument(argument="-z", type="int", floor=0, mandatory=False)
+
+    if not argumentParser.parse(sys.argv):
+        exit(1)
+
+    path = argumentParser.getArgument("-d")
+    folds = argumentParser.getArgument("-k")
+    foldLength = argumentParser.getArgument("-l")
+    engine = argumentParser.getArgument("-e")
+    output = argumentParser.getArgument("-o")
+    cacheSize = argumentParser.getArgument("-z")
+
+    if folds is None:
+        folds = 5
+
+    if engine is None:
+        engine = "keras"
+
+    if cacheSize is None:
+        cacheSize = 256
+
+    if engine not in ModelRegistry.getEngines():
+        print("Error : Argument -e should be one of {}".format(", ".join(ModelRegistry.getEngines())))
+        exit(1)
+
+    if output is not None and os.path.splitext(output)[1].lower() not in FORMATS:
+        print("Error : Argument -o should be the path of a file with one of the {} extensions".format(", ".join(FORMATS)))
+        exit(1)
+
+    curves = parse(path)
+
+    if len(curves) == 0:
+        exit(1)
+
+    # In case the -l parameter was not provided the folds split the last 20% of the values of every Curve, as forecast.py does
+    width = curves.getValues().shape[1]
+    if foldLength is None:
+        foldLength = max(1, int(0.2 * width) // folds)
+
+    if folds * foldLength >= width:
+        print("Error : {} folds of {} values do not fit in Curves of {} values".format(folds, foldLength, width))
+        exit(1)
+
+    registry = ModelRegistry(engine=engine)
+
+    # The normalised windows are cached as in forecast.py
+    cache = WindowCache(path, capacity=cacheSize * 2 ** 20) if cacheSize > 0 else None
+
+    # The generic model is backtested on every Curve with a single batched prediction
+    start = time.perf_counter()
+    generic = backtest(registry.getModel(), curves, registry.getTimesteps(), folds, foldLength, cache=cache)
+    print("Backtest : {} folds of {} values in {:.2f}s".format(folds, foldLength, time.perf_counter() - start))
+    summary("Generic Model", generic)
+    results = [columns(curves, "Generic", generic)]
+
+    # Every dedicated model is backtested on its own Curve over the same folds and is compared against the generic model on that Curve
+    dedicatedIDs = [id for id in registry.getDedicatedIDs() if id in curves]
+    if len(dedicatedIDs) > 0:
+        dedicated = [backtest(registry.getModel(id), curves.select([id]), registry.getTimesteps(id), folds, foldLength, cache=cache) for id in dedicatedIDs]
+        dedicated = {metric: numpy.concatenate([metrics[metric] for metrics in dedicated]) for metric in dedicated[0]}
+        summary("Generic Model on Curves with a Dedicated Model", generic, [curves.indexOf(id) for id in dedicatedIDs])
+        summary("Dedicated Models", dedicated)
+        results.append(columns(curves.select(dedicatedIDs), "Dedicated", dedicated))
+
+    if output is not None and not write({column: numpy.concatenate([result[column] for result in results]) for column in results[0]}, output):
+        exit(1)
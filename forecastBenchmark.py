@@ -0,0 +1,132 @@
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import numpy
+from Utils.ArgumentParser import ArgumentParser
+from Utils.Benchmark import compare, measure
+from Utils.Curve import Curve
+from Utils.Inference import predictSet
+from Utils.Metrics import peakRSS
+from Utils.Parser import parse, writeCSV, writeNPZ
+from Utils.Synthetic import generate
+
+if __name__ == '__main__':
+
+    argumentParser = ArgumentParser()
+    argumentParser.addNumericArgument(argument="-n", type="int", floor=1, mandatory=False)
+    argumentParser.addNumericArgument(argument="-l", type="int", floor=20, mandatory=False)
+    argumentParser.addNumericArgument(argument="-g", type="float", floor=0.0, ceiling=0.9, mandatory=False)
+    argumentParser.addNumericArgument(argument="-r", type="int", floor=1, mandatory=False)
+    argumentParser.addArgument(argument="-m", type="bool", mandatory=False)
+    argumentParser.addArgument(argument="-o", type="str", mandatory=False)
+    argumentParser.addArgument(argument="-b", type="path", mandatory=False)
+    argumentParser.addNumericArgument(argument="-t", type="float", floor=0.0, mandatory=False)
+
+    if not argumentParser.parse(sys.argv):
+        exit(1)
+
+    count = argumentParser.getArgument("-n")
+    length = argumentParser.getArgument("-l")
+    ragged = argumentParser.getArgument("-g")
+    repeats = argumentParser.getArgument("-r")
+    models = argumentParser.getArgument("-m")
+    output = argumentParser.getArgument("-o")
+    baselinePath = argumentParser.getArgument("-b")
+    threshold = argumentParser.getArgument("-t")
+
+    if count is None:
+        count = 1000
+
+    if length is None:
+        length = 300
+
+    if ragged is None:
+        ragged = 0.0
+
+    if repeats is None:
+        repeats = 3
+
+    if models is None:
+        models = True
+
+    if threshold is None:
+        threshold = 0.2
+
+    # The stages are measured on synthetic Curves that are written to a temporary CSV file, with the parameters of forecastTrain.py and forecast.py
+    timesteps = 10
+    trainLength = int(0.8 * length)
+    predictionLength = int(0.2 * length)
+    chunkSize = 1024 if ragged > 0.0 else None
+
+    parameters = {"count": count, "length": length, "ragged": ragged, "repeats": repeats, "timesteps": timesteps}
+    stages = {}
+    directory = tempfile.mkdtemp(prefix="benchmark-")
+    csvPath = os.path.join(directory, "synthetic.csv")
+
+    try:
+        synthetic = generate(count, length, ragged)
+        stages["writeCSV"] = measure(lambda: writeCSV(synthetic, csvPath), repeats)
+        stages["writeNPZ"] = measure(lambda: writeNPZ(synthetic, os.path.join(directory, "synthetic.npz")), repeats)
+
+        stages["parse"] = measure(lambda: parse(csvPath, cache=False, chunkSize=chunkSize), repeats)
+        curves = parse(csvPath, chunkSize=chunkSize)
+        stages["parseCached"] = measure(lambda: parse(csvPath, chunkSize=chunkSize), repeats)
+
+        stages["sample"] = measure(lambda: curves.sample(timesteps, length=trainLength, front=True, includeY=True, normalise=True), repeats)
+        stages["sampleSet"] = measure(lambda: Curve.sampleSet(list(curves), timesteps, length=trainLength, front=True, includeY=True, normalise=True), repeats)
+
+        normalised = curves.normalise()
+        stages["normalise"] = measure(lambda: curves.normalise(), repeats)
+        stages["denormalise"] = measure(lambda: curves.denormalise(normalised), repeats)
+
+        # In case the -m parameter is False TensorFlow is never imported and the stages of the models are skipped
+        # The models are untrained, as only their speed is measured
+        if models:
+            from Utils.NumpyLSTM import NumpyLSTM
+            from Utils.Training import buildModel, experimentParameters
+
+            experimentParameters()
+            model = buildModel(timesteps)
+            numpyModel = NumpyLSTM.fromKeras(model)
+            xTrain, yTrain = curves.sample(timesteps, length=trainLength, front=True, includeY=True, normalise=True)
+
+            stages["predict"] = measure(lambda: predictSet(model, curves, timesteps, predictionLength), repeats)
+            stages["predictNumpy"] = measure(lambda: predictSet(numpyModel, curves, timesteps, predictionLength), repeats)
+            stages["fitEpoch"] = measure(lambda: model.fit(xTrain, yTrain, batch_size=64, epochs=1, verbose=0), repeats)
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    for stage, result in stages.items():
+        print("{:<12} : {:.4f}s (mean {:.4f}s) - peak {:.1f} MiB".format(stage, result["seconds"], result["meanSeconds"], result["peakMemory"] / 2 ** 20))
+
+    results = {
+        "parameters": parameters,
+        "environment": {"python": platform.python_version(), "numpy": numpy.__version__, "machine": platform.machine(), "cpus": os.cpu_count()},
+        "stages": stages,
+        "peakRSS": peakRSS()
+    }
+    if results["peakRSS"] is not None:
+        print("Peak RSS : {:.1f} MiB".format(results["peakRSS"] / 2 ** 20))
+
+    if output is not None:
+        with open(output, "w") as outputFile:
+            json.dump(results, outputFile, indent=4)
+
+    # In case the -b parameter was provided every stage is compared against the same stage of that earlier benchmark
+    # and the benchmark fails in case any stage is more than -t (i.e. 0.2 stands for 20%) slower
+    if baselinePath is not None:
+        with open(baselinePath, "r") as baselineFile:
+            baseline = json.load(baselineFile)
+
+        if baseline["parameters"] != parameters:
+            print("Warning : The baseline was measured with different parameters {}".format(baseline["parameters"]))
+
+        regressions = compare(stages, baseline["stages"], threshold)
+        for stage, seconds, baselineSeconds in regressions:
+            print("Error : Stage {} took {:.4f}s instead of {:.4f}s ({:+.1%})".format(stage, seconds, baselineSeconds, seconds / baselineSeconds - 1.0))
+
+        if len(regressions) > 0:
+            exit(1)
@@ -0,0 +1,70 @@
+import multiprocessing
+import os
+import sys
+import zlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from Utils.ArgumentParser import ArgumentParser
+from Utils.ModelRegistry import ModelRegistry
+from Utils.Parser import parse
+from Utils.Training import trainDedicated
+
+if __name__ == '__main__':
+
+    argumentParser = ArgumentParser()
+    argumentParser.addArgument(argument="-d", type="path", mandatory=True)
+    argumentParser.addArgument(argument="-t", type="str", mandatory=True)
+    argumentParser.addNumericArgument(argument="-w", type="int", floor=1, mandatory=False)
+    argumentParser.addNumericArgument(argument="-s", type="int", floor=1, mandatory=False)
+    argumentParser.addNumericArgument(argument="-e", type="int", floor=1, mandatory=False)
+
+    if not argumentParser.parse(sys.argv):
+        exit(1)
+
+    path = argumentParser.getArgument("-d")
+    tickers = argumentParser.getArgument("-t")
+    workers = argumentParser.getArgument("-w")
+    timesteps = argumentParser.getArgument("-s")
+    epochs = argumentParser.getArgument("-e")
+
+    if workers is None:
+        workers = os.cpu_count()
+
+    if epochs is None:
+        epochs = 10
+
+    curves = parse(path)
+
+    if len(curves) == 0:
+        exit(1)
+
+    # The -t parameter is either "all" or a comma separated list of Curve IDs
+    ids = curves.getIDs() if tickers == "all" else tickers.split(",")
+
+    for id in ids:
+        if id not in curves:
+            print("Error : Curve {} does not exist in {}".format(id, path))
+            exit(1)
+
+    # In case the -s parameter was not provided a Curve that already has a dedicated model keeps its number of timesteps
+    # and every other Curve gets the number of timesteps of the generic model
+    registry = ModelRegistry()
+    directory = "Dedicated-Models"
+
+    # Each model is trained by a single worker process and the cores are split evenly among the workers
+    # The seed of each model depends only on the ID of its Curve, hence the results do not depend on the scheduling of the workers
+    threads = max(1, os.cpu_count() // min(workers, len(ids)))
+    context = multiprocessing.get_context("spawn")
+
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+        futures = []
+
+        for id in ids:
+            curveTimesteps = timesteps
+            if curveTimesteps is None:
+                curveTimesteps = registry.getTimesteps(id) if registry.hasDedicated(id) else registry.getTimesteps()
+            seed = 123 + zlib.crc32(id.encode("utf-8")) % 100000
+            futures.append(executor.submit(trainDedicated, id, curves[id].getValues(), curveTimesteps, directory, seed, threads, epochs))
+
+        for future in as_completed(futures):
+            metadata = future.result()
+            print("{} : Timesteps {} - Loss {:.4e} - Validation Loss {:.4e} - {:.1f}s".format(metadata["id"], metadata["timesteps"], metadata["loss"], metadata["validationLoss"], metadata["seconds"]))
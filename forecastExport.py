@@ -0,0 +1,86 @@
+import sys
+import time
+import numpy
+from Utils.ArgumentParser import ArgumentParser
+from Utils.Inference import predictSet
+from Utils.ModelRegistry import ModelRegistry
+from Utils.NumpyLSTM import NumpyLSTM
+from Utils.Parser import parse
+
+
+# Utility function to measure the average time that a model needs to make a prediction for a single window
+def latency(model, x: numpy.ndarray, repeats: int = 3):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        model.predict(x)
+        timings.append(time.perf_counter() - start)
+    return min(timings) / len(x)
+
+
+if __name__ == '__main__':
+
+    argumentParser = ArgumentParser()
+    argumentParser.addNumericArgument(argument="-t", type="float", floor=0.0, mandatory=False)
+    argumentParser.addArgument(argument="-q", type="str", mandatory=False)
+    argumentParser.addArgument(argument="-d", type="path", mandatory=False)
+
+    if not argumentParser.parse(sys.argv):
+        exit(1)
+
+    tolerance = argumentParser.getArgument("-t")
+    precision = argumentParser.getArgument("-q")
+    path = argumentParser.getArgument("-d")
+
+    if tolerance is None:
+        tolerance = 1e-4
+
+    if precision is not None and precision not in NumpyLSTM.getPrecisions()[1:]:
+        print("Error : Argument -q should be one of {}".format(", ".join(NumpyLSTM.getPrecisions()[1:])))
+        exit(1)
+
+    curves = parse(path) if path is not None else []
+    registry = ModelRegistry()
+    numpy.random.seed(123)
+
+    # The weights of the generic model and of every dedicated model are exported next to their SavedModel (i.e. Model.npz)
+    # The NumpyLSTM model makes a prediction for a set of random windows and is compared against the Keras model
+    for id in [None] + registry.getDedicatedIDs():
+        modelPath = registry.getPath(id)
+        model = registry.getModel(id)
+        numpyModel = NumpyLSTM.fromKeras(model)
+        numpyModel.save(NumpyLSTM.exportPath(modelPath))
+
+        x = numpy.random.rand(1024, registry.getTimesteps(id), 1).astype("float32")
+        difference = numpy.max(numpy.abs(model.predict(x, batch_size=1024, verbose=0) - numpyModel.predict(x)))
+        print("{} : Maximum absolute difference from the Keras model {:.2e}".format(NumpyLSTM.exportPath(modelPath), difference))
+
+        if difference > tolerance:
+            print("Error : The predictions of {} differ from the ones of the Keras model by more than {}".format(NumpyLSTM.exportPath(modelPath), tolerance))
+            exit(1)
+
+        if precision is None:
+            continue
+
+        # In case the -q parameter was provided the weights are also exported in the corresponding precision (e.g. Model.int8.npz)
+        # and the quantized model is compared against the float32 one in terms of size, latency and accuracy
+        quantizedModel = numpyModel.quantized(precision)
+        quantizedModel.save(NumpyLSTM.exportPath(modelPath, precision))
+
+        print("{} : {} bytes instead of {} bytes, {:.2e}s instead of {:.2e}s per window".format(
+            NumpyLSTM.exportPath(modelPath, precision), quantizedModel.getSize(), numpyModel.getSize(), latency(quantizedModel, x), latency(numpyModel, x)))
+
+        # In case the -d parameter was provided the MSE of every Curve is calculated as forecast.py does
+        # The generic model is evaluated on every Curve and each dedicated model on its own Curve
+        if len(curves) == 0:
+            continue
+
+        evaluated = curves if id is None else curves.select([id]) if id in curves else []
+
+        if len(evaluated) > 0:
+            predictionLength = int(0.2 * len(curves[0]))
+            _, mses = predictSet(numpyModel, evaluated, registry.getTimesteps(id), predictionLength)
+            _, quantizedMses = predictSet(quantizedModel, evaluated, registry.getTimesteps(id), predictionLength)
+            print("{} : Mean MSE {:.4e} instead of {:.4e} ({:+.2%}), maximum MSE increase of a Curve {:.2e}".format(
+                NumpyLSTM.exportPath(modelPath, precision), numpy.nanmean(quantizedMses), numpy.nanmean(mses),
+                numpy.nanmean(quantizedMses) / numpy.nanmean(mses) - 1.0, numpy.nanmax(quantizedMses - mses)))
@@ -0,0 +1,60 @@
+import sys
+from Utils.ArgumentParser import ArgumentParser
+from Utils.ModelRegistry import ModelRegistry
+from Utils.Parser import parse
+from Utils.Server import ForecastServer
+
+if __name__ == '__main__':
+
+    argumentParser = ArgumentParser()
+    argumentParser.addArgument(argument="-d", type="path", mandatory=False)
+    argumentParser.addNumericArgument(argument="-p", type="int", floor=1, ceiling=65535, mandatory=False)
+    argumentParser.addArgument(argument="-e", type="str", mandatory=False)
+    argumentParser.addNumericArgument(argument="-b", type="float", floor=0.0, mandatory=False)
+    argumentParser.addNumericArgument(argument="-m", type="int", floor=1, mandatory=False)
+
+    if not argumentParser.parse(sys.argv):
+        exit(1)
+
+    path = argumentParser.getArgument("-d")
+    port = argumentParser.getArgument("-p")
+    engine = argumentParser.getArgument("-e")
+    budget = argumentParser.getArgument("-b")
+    maxBatch = argumentParser.getArgument("-m")
+
+    if port is None:
+        port = 8000
+
+    if engine is None:
+        engine = "keras"
+
+    if budget is None:
+        budget = 5.0
+
+    if maxBatch is None:
+        maxBatch = 4096
+
+    if engine not in ModelRegistry.getEngines():
+        print("Error : Argument -e should be one of {}".format(", ".join(ModelRegistry.getEngines())))
+        exit(1)
+
+    # In case the -d parameter was provided a request may forecast one of its Curves by ID alone
+    curves = None
+    if path is not None:
+        curves = parse(path)
+        if len(curves) == 0:
+            exit(1)
+
+    # The generic model is loaded before the server starts, so that the first request does not pay for it
+    # The -b parameter is the latency budget (in milliseconds) that a request may wait for other requests to share its batch
+    registry = ModelRegistry(engine=engine)
+    registry.getModel()
+    server = ForecastServer(registry, curves, port=port, budget=budget / 1000.0, maxBatch=maxBatch)
+
+    host, port = server.getAddress()
+    print("Serving on http://{}:{} (POST /forecast, GET /stats)".format(host, port))
+
+    try:
+        server.serve()
+    except KeyboardInterrupt:
+        pass
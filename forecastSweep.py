@@ -0,0 +1,82 @@
+import json
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy
+from Utils.ArgumentParser import ArgumentParser
+from Utils.Parser import parse
+from Utils.Report import FORMATS, write
+from Utils.Sweep import SweepWindowStore, grid, randomSearch, runTrial
+
+if __name__ == '__main__':
+
+    argumentParser = ArgumentParser()
+    argumentParser.addArgument(argument="-d", type="path", mandatory=True)
+    argumentParser.addArgument(argument="-c", type="path", mandatory=True)
+    argumentParser.addArgument(argument="-o", type="str", mandatory=True)
+    argumentParser.addNumericArgument(argument="-r", type="int", floor=1, mandatory=False)
+    argumentParser.addNumericArgument(argument="-w", type="int", floor=1, mandatory=False)
+    argumentParser.addNumericArgument(argument="-p", type="int", floor=1, mandatory=False)
+
+    if not argumentParser.parse(sys.argv):
+        exit(1)
+
+    path = argumentParser.getArgument("-d")
+    spacePath = argumentParser.getArgument("-c")
+    output = argumentParser.getArgument("-o")
+    trials = argumentParser.getArgument("-r")
+    workers = argumentParser.getArgument("-w")
+    patience = argumentParser.getArgument("-p")
+
+    if workers is None:
+        workers = os.cpu_count()
+
+    if patience is None:
+        patience = 3
+
+    if os.path.splitext(output)[1].lower() not in FORMATS:
+        print("Error : Argument -o should be the path of a file with one of the {} extensions".format(", ".join(FORMATS)))
+        exit(1)
+
+    # The search space is a JSON file that maps each parameter (i.e. timesteps, batchSize, epochs, units, trainPercent) to a list of values
+    # In case the -r parameter was provided that many configurations are drawn at random, otherwise every configuration is tried
+    with open(spacePath, "r") as spaceFile:
+        space = json.load(spaceFile)
+
+    configurations = grid(space) if trials is None else randomSearch(space, trials)
+
+    curves = parse(path)
+
+    if len(curves) == 0:
+        exit(1)
+
+    # The windows of every distinct (timesteps, length) key are built once before any trial starts
+    # and are shared by every configuration with the same key
+    directory = tempfile.mkdtemp(prefix="sweep-")
+    cache = SweepWindowStore(curves, directory)
+    paths = [cache.get(configuration["timesteps"], int(configuration["trainPercent"] * len(curves[0]))) for configuration in configurations]
+    print("Sweep : {} configurations share {} sets of windows".format(len(configurations), cache.getStatistics()["builds"]))
+
+    threads = max(1, os.cpu_count() // min(workers, len(configurations)))
+    results = []
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+            futures = [executor.submit(runTrial, configuration, xPath, yPath, 123 + i, threads, patience) for i, (configuration, (xPath, yPath)) in enumerate(zip(configurations, paths))]
+            for future in as_completed(futures):
+                result = future.result()
+                results.append(result)
+                print("Trial {}/{} : Validation Loss {:.4e} - {:.1f}s - {}".format(len(results), len(futures), result["validationLoss"], result["seconds"], {parameter: result[parameter] for parameter in space}))
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    # The results are ranked by their validation loss and then by their training time
+    results.sort(key=lambda result: (result["validationLoss"], result["seconds"]))
+    columns = {"rank": numpy.arange(1, len(results) + 1)}
+    columns.update({column: numpy.array([result[column] for result in results]) for column in results[0]})
+
+    if not write(columns, output):
+        exit(1)
@@ -1,60 +1,89 @@
-import os
-import random
 import sys
-import numpy
-import tensorflow
+from Utils import Metrics
 from Utils.ArgumentParser import ArgumentParser
-from tensorflow.keras.layers import LSTM, Dropout, Dense
-from tensorflow.keras.models import Sequential
-from Utils.Curve import Curve
 from Utils.Parser import parse
-
-
-# Utility function to ensure the reproducibility of the results
-# The function's functionality is described in the following link :
-# - https://keras.io/getting_started/faq/#how-can-i-obtain-reproducible-results-using-keras-during-development
-def experimentParameters():
-    seed = 123
-    os.environ['PYTHONHASHSEED'] = str(seed)
-    random.seed(seed)
-    tensorflow.random.set_seed(seed)
-    numpy.random.seed(seed)
-    os.environ['TF_DETERMINISTIC_OPS'] = '1'
-    os.environ['TF_CUDNN_DETERMINISTIC'] = '1'
-    tensorflow.config.threading.set_inter_op_parallelism_threads(1)
-    tensorflow.config.threading.set_intra_op_parallelism_threads(1)
+from Utils.Pipeline import streamSet
+from Utils.Training import ThroughputCallback, buildModel, experimentParameters, performanceParameters
 
 
 if __name__ == '__main__':
 
-    experimentParameters()
-
     argumentParser = ArgumentParser()
     argumentParser.addArgument(argument="-d", type="path", mandatory=True)
+    argumentParser.addArgument(argument="-s", type="bool", mandatory=False)
+    argumentParser.addArgument(argument="-p", type="bool", mandatory=False)
+    argumentParser.addArgument(argument="-x", type="bool", mandatory=False)
+    argumentParser.addArgument(argument="-f", type="bool", mandatory=False)
+    argumentParser.addNumericArgument(argument="-b", type="int", floor=1, mandatory=False)
+    argumentParser.addArgument(argument="-j", type="str", mandatory=False)
+    argumentParser.addArgument(argument="-c", type="str", mandatory=False)
 
     if not argumentParser.parse(sys.argv):
         exit(1)
 
     path = argumentParser.getArgument("-d")
+    stream = argumentParser.getArgument("-s")
+    performance = argumentParser.getArgument("-p")
+    jit = argumentParser.getArgument("-x")
+    bfloat16 = argumentParser.getArgument("-f")
+    batchSize = argumentParser.getArgument("-b")
+    summaryPath = argumentParser.getArgument("-j")
+    profilePath = argumentParser.getArgument("-c")
+
+    if stream is None:
+        stream = False
+
+    if performance is None:
+        performance = False
+
+    if jit is None:
+        jit = False
 
-    curves = parse(path)
+    if bfloat16 is None:
+        bfloat16 = False
+
+    # In case the -p parameter was provided every thread is used at the expense of bit-exact reproducibility
+    # In that mode the -x parameter enables XLA compilation and the -f parameter enables bfloat16 on CPUs that support it
+    if performance:
+        usedBfloat16 = performanceParameters(bfloat16=bfloat16)
+        if bfloat16 and not usedBfloat16:
+            print("Warning : The CPU does not support bfloat16, float32 will be used instead")
+        if batchSize is None:
+            batchSize = 512
+    else:
+        experimentParameters()
+        jit = False
+        if batchSize is None:
+            batchSize = 64
+
+    # In case the -j or the -c parameter was provided the run is instrumented as in forecast.py
+    if summaryPath is not None or profilePath is not None:
+        Metrics.enable("-" if summaryPath is None else summaryPath, profilePath)
+
+    with Metrics.stage("parse"):
+        curves = parse(path)
 
     features = 1
     timesteps = 10
-    batchSize = 64
     epochs = 10
     validationSplit = 0.25
     trainLength = int(0.8 * len(curves[0]))
 
+    with Metrics.stage("build"):
+        model = buildModel(timesteps, features, jit=jit)
 
-    model = Sequential()
-    model.add(LSTM(64, return_sequences=True, input_shape=(timesteps, features)))
-    model.add(Dropout(0.1))
-    model.add(LSTM(64, return_sequences=False))
-    model.add(Dense(features))
-    model.compile(optimizer='adam', loss='mse')
-
-
-    xTrain, yTrain = Curve.sampleSet(curves, timesteps, length=trainLength, front=True, includeY=True, normalise=True)
-    xTrain = numpy.reshape(xTrain, (xTrain.shape[0], timesteps, features))
-    fitSummary = model.fit(xTrain, yTrain, batch_size=batchSize, epochs=epochs, verbose=1, validation_split=validationSplit)
+    # In case the -s parameter was provided the windows are built per Curve on the fly instead of being materialised in memory
+    # The throughput of every epoch is measured on the training samples, that is the ones that are not held out for validation
+    if stream:
+        windows = sum(max(0, min(trainLength, len(curve)) - timesteps) for curve in curves)
+        throughput = ThroughputCallback(int(windows * (1.0 - validationSplit)))
+        Metrics.count("windows", windows)
+        trainDataset, validationDataset = streamSet(curves, timesteps, length=trainLength, front=True, normalise=True, batchSize=batchSize, validationSplit=validationSplit, seed=123)
+        with Metrics.stage("fit"):
+            fitSummary = model.fit(trainDataset, epochs=epochs, verbose=1, validation_data=validationDataset, callbacks=[throughput])
+    else:
+        with Metrics.stage("window"):
+            xTrain, yTrain = curves.sample(timesteps, length=trainLength, front=True, includeY=True, normalise=True)
+        throughput = ThroughputCallback(int(len(xTrain) * (1.0 - validationSplit)))
+        with Metrics.stage("fit"):
+            fitSummary = model.fit(xTrain, yTrain, batch_size=batchSize, epochs=epochs, verbose=1, validation_split=validationSplit, callbacks=[throughput])